@@ -0,0 +1,113 @@
+import os
+import sqlite3
+import time
+from collections import namedtuple
+
+# The calls seen in earlier runs, next to the codes
+DB_PATH = os.path.join(os.path.dirname(os.path.abspath(__file__)), "open_calls.sqlite")
+
+# What changed since the last scrape. new/changed/unchanged are the scraped call dicts,
+# closed are the stored calls that are not on the list anymore.
+CallDiff = namedtuple("CallDiff", ["new", "changed", "closed", "unchanged"])
+
+class CallStore:
+    """
+    Remembers every open call seen before (keyed by link) in a small SQLite file,
+    so each scrape can be compared with the last one: which calls are new, which
+    have changed (title or date) and which have closed. The subject area of a call
+    is stored too, so it only has to be fetched again for new or changed calls.
+    """
+    def __init__(self, db_path=DB_PATH):
+        self.connection = sqlite3.connect(db_path)
+        self.connection.row_factory = sqlite3.Row
+        with self.connection:
+            self.connection.execute("""
+                CREATE TABLE IF NOT EXISTS calls (
+                    link TEXT PRIMARY KEY,
+                    title TEXT,
+                    date TEXT,
+                    subject_area TEXT,   -- NULL = not fetched yet, '' = the page has no subject area
+                    first_seen REAL,
+                    last_seen REAL,
+                    closed_at REAL       -- NULL while the call is open
+                )""")
+
+    def stored_calls(self):
+        return {row["link"]: row for row in self.connection.execute("SELECT * FROM calls")}
+
+    def diff(self, calls, complete=False):
+        """
+        Compares a scrape with the store, without saving anything. Stored calls missing from
+        the scrape only count as closed if the scrape is complete (the whole list was read),
+        a partial list (e.g. from the browser) says nothing about the calls it doesn't show.
+        """
+        stored = self.stored_calls()
+        scraped_links = {call["Link"] for call in calls}
+        new, changed, unchanged = [], [], []
+        for call in calls:
+            row = stored.get(call["Link"])
+            if row is None or row["closed_at"] is not None:
+                new.append(call)  # Never seen, or closed before and open again
+            elif (row["title"], row["date"]) != (call["Title"], call["Date"]):
+                changed.append(call)
+            else:
+                unchanged.append(call)
+        closed = [dict(Title=row["title"], Link=row["link"], Date=row["date"])
+                  for link, row in stored.items()
+                  if complete and row["closed_at"] is None and link not in scraped_links]
+        return CallDiff(new, changed, closed, unchanged)
+
+    def update(self, calls, complete=False):
+        """Saves a scrape and returns what changed since the last one (a CallDiff), see diff()."""
+        call_diff = self.diff(calls, complete)
+        now = time.time()
+        with self.connection:
+            for call in call_diff.new + call_diff.changed:
+                # New or changed: the subject area has to be fetched (again), but a call that
+                # reopened with the same title and date keeps the one that is stored
+                self.connection.execute("""
+                    INSERT INTO calls (link, title, date, subject_area, first_seen, last_seen, closed_at)
+                    VALUES (?, ?, ?, NULL, ?, ?, NULL)
+                    ON CONFLICT(link) DO UPDATE SET title = excluded.title, date = excluded.date,
+                        subject_area = CASE WHEN calls.title IS excluded.title AND calls.date IS excluded.date
+                                            THEN calls.subject_area ELSE NULL END,
+                        last_seen = excluded.last_seen, closed_at = NULL""",
+                    (call["Link"], call["Title"], call["Date"], now, now))
+            self.connection.executemany("UPDATE calls SET last_seen = ? WHERE link = ?",
+                                        [(now, call["Link"]) for call in call_diff.unchanged])
+            self.connection.executemany("UPDATE calls SET closed_at = ? WHERE link = ?",
+                                        [(now, call["Link"]) for call in call_diff.closed])
+        return call_diff
+
+    def subject_areas(self, links):
+        """{link: subject area} for the calls whose subject area is known ('' if the page has none)."""
+        links = list(links)
+        rows = []
+        for start in range(0, len(links), 500):  # SQLite limits the number of ? in one query
+            part = links[start:start + 500]
+            rows += self.connection.execute(
+                f"SELECT link, subject_area FROM calls WHERE subject_area IS NOT NULL "
+                f"AND link IN ({', '.join('?' * len(part))})", part).fetchall()
+        return {row["link"]: row["subject_area"] for row in rows}
+
+    def links_needing_subject(self, links):
+        """The links (in the same order) whose subject area still has to be fetched."""
+        known = self.subject_areas(links)
+        return [link for link in links if link not in known]
+
+    def set_subject_area(self, link, subject_area):
+        with self.connection:
+            self.connection.execute("UPDATE calls SET subject_area = ? WHERE link = ?", (subject_area or "", link))
+
+    def close(self):
+        self.connection.close()
+
+def print_call_diff(call_diff):
+    print(f"Since the last run: {len(call_diff.new)} new, {len(call_diff.changed)} changed, "
+          f"{len(call_diff.closed)} closed, {len(call_diff.unchanged)} unchanged")
+    for label, calls in (("New", call_diff.new), ("Changed", call_diff.changed), ("Closed", call_diff.closed)):
+        for call in calls:
+            print(f"{label}: {call['Title']} ({call['Date']})\n  {call['Link']}")
+
+# This file is used by open_calls.py and user_open_calls.py, you don't need to run it.
+# It keeps the calls from earlier runs in open_calls.sqlite, delete that file to start over.
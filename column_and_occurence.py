@@ -1,7 +1,21 @@
-import pandas as pd
+import sys
 import re
 from tkinter import Tk
 from tkinter.filedialog import askopenfilename
+import csv_loader
+
+# Number of rows read at a time in streaming mode
+CHUNK_SIZE = 50_000
+
+# All main research subject labels from the SCB standard (Standard för svensk indelning av forskningsämnen)
+SCB_SUBJECT_LABELS = [
+    "¤¤¤ 1: Naturvetenskap",
+    "¤¤¤ 2: Teknik",
+    "¤¤¤ 3: Medicin och hälsovetenskap",
+    "¤¤¤ 4: Lantbruksvetenskap och veterinärmedicin",
+    "¤¤¤ 5: Samhällsvetenskap",
+    "¤¤¤ 6: Humaniora och konst",
+]
 
 def list_columns(file_path):
     """
@@ -9,7 +23,7 @@ def list_columns(file_path):
     Returns the DataFrame.
     """
     try:
-        df = pd.read_csv(file_path, sep=";", encoding="utf-8", on_bad_lines='skip')
+        df = csv_loader.load_csv(file_path)
         print("List of columns:")
         for idx, col in enumerate(df.columns, start=1):
             print(f"{idx}: {col}")
@@ -18,50 +32,105 @@ def list_columns(file_path):
         print("Error reading CSV file:", e)
         return None
 
-def count_occurrences_in_scbs(df):
+def list_columns_header(file_path):
     """
-    Counts occurrences of the following exact strings in the 'Scbs' column:
-      - "¤¤¤ 1: Naturvetenskap"
-      - "¤¤¤ 3: Medicin och hälsovetenskap"
-      - "¤¤¤ 2: Teknik"
+    Reads only the header row of the CSV file and prints each column with its index.
+    Returns True if the header could be read.
+    """
+    try:
+        columns = csv_loader.read_columns(file_path)
+        print("List of columns:")
+        for idx, col in enumerate(columns, start=1):
+            print(f"{idx}: {col}")
+        return 'Scbs' in columns
+    except Exception as e:
+        print("Error reading CSV file:", e)
+        return False
+
+def build_label_pattern(labels):
+    """
+    Combines all literal labels into one compiled alternation, so a text is
+    scanned once no matter how many labels there are.
+    Longer labels are tried first in case one label is a prefix of another.
+    """
+    ordered = sorted(labels, key=len, reverse=True)
+    return re.compile("|".join(re.escape(label) for label in ordered))
+
+def count_occurrences_in_scbs(df, labels=SCB_SUBJECT_LABELS):
+    """
+    Counts occurrences of every SCB subject label (e.g. "¤¤¤ 1: Naturvetenskap")
+    in the 'Scbs' column and prints them.
+    Returns a dict with the count per label.
     """
     if 'Scbs' not in df.columns:
         print("Error: The file does not contain a 'Scbs' column.")
         return
 
-    # Initialize counters for each pattern
-    count_natur = 0
-    count_medicin = 0
-    count_teknik = 0
-
-    # Define the patterns using re.escape to match the strings literally
-    pattern_natur    = re.escape("¤¤¤ 1: Naturvetenskap")
-    pattern_medicin  = re.escape("¤¤¤ 3: Medicin och hälsovetenskap")
-    pattern_teknik   = re.escape("¤¤¤ 2: Teknik")
-
-    # Iterate through each value in the 'Scbs' column
-    for i, value in enumerate(df["Scbs"]):
-        if isinstance(value, str):
-            count_natur    += len(re.findall(pattern_natur, value))
-            count_medicin  += len(re.findall(pattern_medicin, value))
-            count_teknik   += len(re.findall(pattern_teknik, value))
-    
+    counts = count_scbs_values(df["Scbs"], labels)
+    print_counts(counts)
+    return counts
+
+def count_scbs_values(values, labels=SCB_SUBJECT_LABELS, pattern=None):
+    """
+    Counts the labels in an iterable of 'Scbs' values with a single scan.
+    Returns a dict with the count per label.
+    """
+    if pattern is None:
+        pattern = build_label_pattern(labels)
+
+    # The labels never contain a newline, so joining the cells with one
+    # lets the combined pattern run over the whole column in one go
+    text = "\n".join(value for value in values if isinstance(value, str))
+
+    counts = dict.fromkeys(labels, 0)
+    for match in pattern.findall(text):
+        counts[match] += 1
+    return counts
+
+def count_occurrences_in_scbs_streaming(file_path, labels=SCB_SUBJECT_LABELS, chunksize=CHUNK_SIZE):
+    """
+    Same counts as count_occurrences_in_scbs, but reads the CSV file in chunks
+    and only loads the 'Scbs' column, so memory use stays flat for huge files.
+    """
+    pattern = build_label_pattern(labels)
+    counts = dict.fromkeys(labels, 0)
+
+    try:
+        # If the file was loaded before, its binary cache gives the Scbs column batch by batch
+        chunks = (csv_loader.iter_cached_chunks(file_path, columns=['Scbs'])
+                  or csv_loader.iter_csv_chunks(file_path, chunksize, columns=['Scbs']))
+        for chunk, fraction in chunks:
+            for label, count in count_scbs_values(chunk["Scbs"], labels, pattern).items():
+                counts[label] += count
+    except Exception as e:
+        print("Error reading CSV file:", e)
+        return
+
+    print_counts(counts)
+    return counts
+
+def print_counts(counts):
     print("\nPattern Occurrence Counts in 'Scbs' Column:")
-    print(f"Occurrences of '¤¤¤ 1: Naturvetenskap': {count_natur}")
-    print(f"Occurrences of '¤¤¤ 3: Medicin och hälsovetenskap': {count_medicin}")
-    print(f"Occurrences of '¤¤¤ 2: Teknik': {count_teknik}")
+    for label, count in counts.items():
+        print(f"Occurrences of '{label}': {count}")
 
-def load_file_and_process():
+def load_file_and_process(streaming=False):
     # Hide the Tkinter root window
     Tk().withdraw()
     
     # Open a file dialog to select a CSV file
     file_path = askopenfilename(
         title="Select CSV File", 
-        filetypes=[("CSV Files", "*.csv")]
+        filetypes=csv_loader.FILE_TYPES
     )
     
-    if file_path:
+    if file_path and streaming:
+        # Only read the header, then count chunk by chunk
+        if list_columns_header(file_path):
+            count_occurrences_in_scbs_streaming(file_path)
+        else:
+            print("Error: The file does not contain a 'Scbs' column.")
+    elif file_path:
         # List all columns and retrieve the DataFrame
         df = list_columns(file_path)
         if df is not None:
@@ -71,8 +140,10 @@ def load_file_and_process():
         print("No file selected.")
 
 if __name__ == "__main__":
-    load_file_and_process()
+    load_file_and_process(streaming="--stream" in sys.argv)
 
 # After running the file it will ask for teh CSV file you wanna look trough.
-# then in the terminal it will list all the COLUMNS and titles and occurence of the predetermined main 3 themes.
-#  these results will show up in the terminal below
\ No newline at end of file
+# then in the terminal it will list all the COLUMNS and titles and occurence of all the main SCB subject themes.
+#  these results will show up in the terminal below
+# For very big CSV files (several GB) run it with: python column_and_occurence.py --stream
+# then it reads the file in small pieces and only the Scbs column, so it doesn't run out of memory.
\ No newline at end of file
@@ -0,0 +1,370 @@
+import codecs
+import contextlib
+import csv
+import glob
+import gzip
+import hashlib
+import os
+import re
+import sys
+import time
+import zipfile
+import pandas as pd
+from pandas._libs.parsers import STR_NA_VALUES
+
+try:
+    import pyarrow
+    import pyarrow.csv as arrow_csv
+    import pyarrow.feather as feather
+    import pyarrow.compute
+    import pyarrow.ipc
+except ImportError:  # Without pyarrow everything still works, just slower and without the cache
+    pyarrow = arrow_csv = feather = None
+
+try:
+    import zstandard
+except ImportError:  # Only needed for .zst files
+    zstandard = None
+
+# Folder (next to the CSV file) where the binary copies are stored
+CACHE_DIR_NAME = ".csv_cache"
+# Part of the cache key: raise it when the loading changes, so older copies are not used anymore
+CACHE_VERSION = 3
+
+# For the file dialogs: plain CSV files and compressed exports
+FILE_TYPES = [("CSV Files", "*.csv *.zip *.gz *.zst"), ("All Files", "*.*")]
+
+# How all the tools read the SweCRIS exports when the format can't be sniffed
+READ_OPTIONS = dict(sep=None, engine='python', encoding="utf-8", on_bad_lines='skip')
+
+# Sniffing looks at this many bytes from the start of the file
+SNIFF_BYTES = 64 * 1024
+SNIFF_DELIMITERS = ";,\t|"
+SNIFF_ENCODINGS = ("utf-8", "cp1252")
+
+@contextlib.contextmanager
+def open_csv_stream(file_path):
+    """
+    Opens a CSV file for reading as bytes. .zip, .gz and .zst archives are
+    decompressed on the fly while reading, nothing is unpacked to disk.
+    Yields (stream, raw) where raw is the file on disk, so raw.tell()
+    shows how far into the (compressed) file the reading has come.
+    """
+    extension = os.path.splitext(file_path)[1].lower()
+    with open(file_path, 'rb') as raw:
+        if extension == ".gz":
+            with gzip.GzipFile(fileobj=raw) as stream:
+                yield stream, raw
+        elif extension == ".zip":
+            with zipfile.ZipFile(raw) as archive:
+                # Use the first CSV file in the archive (or the first file if there is no .csv)
+                names = [info.filename for info in archive.infolist() if not info.is_dir()]
+                if not names:
+                    raise ValueError(f"The zip file {file_path} is empty.")
+                csv_names = [name for name in names if name.lower().endswith(".csv")]
+                with archive.open((csv_names or names)[0]) as stream:
+                    yield stream, raw
+        elif extension == ".zst":
+            if zstandard is None:
+                raise ImportError("Reading .zst files needs the zstandard package (pip install zstandard).")
+            with zstandard.ZstdDecompressor().stream_reader(raw) as stream:
+                yield stream, raw
+        else:
+            yield raw, raw
+
+def sniff_format(file_path):
+    """
+    Guesses the delimiter and encoding from the first few KB of the file.
+    Returns (delimiter, encoding), or None if the guess isn't clear enough.
+    """
+    with open_csv_stream(file_path) as (stream, raw):
+        sample = read_at_most(stream, SNIFF_BYTES)
+    complete_file = len(sample) < SNIFF_BYTES
+
+    for encoding in SNIFF_ENCODINGS:
+        try:
+            # final=complete_file: a multi-byte character cut off at the end of the sample is not an error
+            text = codecs.getincrementaldecoder(encoding)().decode(sample, final=complete_file)
+            break
+        except UnicodeDecodeError:
+            continue
+    else:
+        return None
+
+    # Only look at complete lines
+    if not complete_file:
+        text = text[:text.rfind("\n") + 1]
+    if not text.strip():
+        return None
+
+    try:
+        delimiter = csv.Sniffer().sniff(text, delimiters=SNIFF_DELIMITERS).delimiter
+    except csv.Error:
+        return None
+
+    # Double check: the rows in the sample should have as many fields as the header.
+    # (csv.reader handles quoted fields that span several lines)
+    rows = list(csv.reader(text.splitlines(keepends=True), delimiter=delimiter))
+    if len(rows[0]) < 2:
+        return None
+    if len(rows) > 1:
+        matching = sum(1 for row in rows[1:] if len(row) == len(rows[0]))
+        if matching < 0.8 * (len(rows) - 1):
+            return None
+    return delimiter, encoding
+
+def read_at_most(stream, size):
+    """Reads up to size bytes (decompressing streams may return less per read call)."""
+    parts = []
+    while size > 0:
+        part = stream.read(size)
+        if not part:
+            break
+        parts.append(part)
+        size -= len(part)
+    return b"".join(parts)
+
+def parse_options(file_path):
+    """
+    The read_csv options for a file: the fast C parser with the sniffed delimiter
+    and encoding, or the old python-engine autodetection if sniffing was unsure.
+    """
+    sniffed = sniff_format(file_path)
+    if sniffed is None:
+        return dict(READ_OPTIONS)
+    delimiter, encoding = sniffed
+    return dict(sep=delimiter, engine='c', encoding=encoding, on_bad_lines='skip')
+
+def cache_path_for(file_path):
+    """
+    Returns the path of the sidecar cache file for a CSV file.
+    The name depends on the full path, size and modification time of the CSV,
+    so a changed or replaced file never uses an old cache.
+    """
+    file_path = os.path.abspath(file_path)
+    stat = os.stat(file_path)
+    key = f"{file_path}|{stat.st_size}|{stat.st_mtime_ns}|{CACHE_VERSION}"
+    digest = hashlib.sha1(key.encode("utf-8")).hexdigest()[:16]
+    cache_dir = os.path.join(os.path.dirname(file_path), CACHE_DIR_NAME)
+    return os.path.join(cache_dir, f"{os.path.basename(file_path)}.{digest}.feather")
+
+def load_cached(file_path, columns=None):
+    """Returns the cached DataFrame for a CSV file, or None if there is no usable cache."""
+    if feather is None:
+        return None
+    cache_path = cache_path_for(file_path)
+    if not os.path.exists(cache_path):
+        return None
+    try:
+        # Memory-mapped, so only the columns asked for are actually read from disk
+        table = feather.read_table(cache_path, columns=columns, memory_map=True)
+        return table.to_pandas()
+    except Exception:
+        return None
+
+def iter_cached_chunks(file_path, columns=None):
+    """
+    Like iter_csv_chunks, but from the cache: yields (chunk, fraction) one record batch
+    (about 64K rows) at a time, so even a huge file never has to be in memory at once.
+    Returns None if there is no usable cache.
+    """
+    if feather is None:
+        return None
+    cache_path = cache_path_for(file_path)
+    try:
+        reader = pyarrow.ipc.open_file(pyarrow.memory_map(cache_path))
+    except Exception:
+        return None
+
+    def chunks():
+        for i in range(reader.num_record_batches):
+            batch = reader.get_batch(i)
+            if columns is not None:
+                batch = batch.select(columns)
+            yield batch.to_pandas(), (i + 1) / reader.num_record_batches
+    return chunks()
+
+def save_cache(file_path, df):
+    """Writes a DataFrame as the sidecar cache of a CSV file. Failing to cache is not an error."""
+    if feather is None:
+        return False
+    cache_path = cache_path_for(file_path)
+    cache_dir = os.path.dirname(cache_path)
+    tmp_path = cache_path + ".tmp"
+    try:
+        os.makedirs(cache_dir, exist_ok=True)
+        feather.write_feather(df.reset_index(drop=True), tmp_path)
+        os.replace(tmp_path, cache_path)
+    except Exception:
+        # E.g. a read-only folder or a column pyarrow can't store
+        if os.path.exists(tmp_path):
+            os.remove(tmp_path)
+        return False
+
+    # Remove caches of older versions of the same file (only exactly "<name>.<key>.feather",
+    # so data.csv doesn't remove the cache of data.csv.gz)
+    old_name = re.compile(re.escape(os.path.basename(file_path)) + r"\.[0-9a-f]{16}\.feather")
+    for name in os.listdir(cache_dir):
+        old_path = os.path.join(cache_dir, name)
+        if old_name.fullmatch(name) and old_path != cache_path:
+            try:
+                os.remove(old_path)
+            except OSError:
+                pass
+    return True
+
+def pandas_convert_options(**options):
+    """pyarrow conversion options that read values like pandas does."""
+    return arrow_csv.ConvertOptions(
+        null_values=sorted(STR_NA_VALUES),  # "None", "<NA>", "n/a"... are missing values too
+        strings_can_be_null=True,  # Empty fields are missing values
+        true_values=["True", "TRUE", "true"], false_values=["False", "FALSE", "false"],  # Not 1 and 0
+        **options)
+
+def is_temporal(data_type):
+    return (pyarrow.types.is_date(data_type) or pyarrow.types.is_time(data_type)
+            or pyarrow.types.is_timestamp(data_type))
+
+def temporal_columns(file_path, read_options, parse_options):
+    """
+    The columns pyarrow would turn into dates, times or timestamps. The types are guessed
+    from the first block of the file, so only that block is read here.
+    """
+    with open_csv_stream(file_path) as (stream, raw):
+        reader = arrow_csv.open_csv(
+            stream, read_options=read_options,
+            parse_options=arrow_csv.ParseOptions(delimiter=parse_options.delimiter, newlines_in_values=True,
+                                                 invalid_row_handler=lambda row: 'skip'),
+            convert_options=pandas_convert_options())
+        return [field.name for field in reader.schema if is_temporal(field.type)]
+
+def read_csv_with_pyarrow(file_path, delimiter, encoding):
+    """
+    Parses the CSV file with pyarrow's multithreaded reader.
+    Returns None for files where the result could differ from pandas' own parser.
+    """
+    short_rows = []
+
+    def on_invalid_row(row):
+        # pandas skips rows with too many fields but keeps rows with too few (filled with NaN)
+        if row.actual_columns < row.expected_columns:
+            short_rows.append(row.number)
+        return 'skip'
+
+    read_options = arrow_csv.ReadOptions(encoding=encoding)
+    parse_options = arrow_csv.ParseOptions(delimiter=delimiter, newlines_in_values=True,
+                                           invalid_row_handler=on_invalid_row)
+    # Like pandas: dates and times stay as the text in the file. pyarrow recognises ISO dates
+    # even without timestamp parsers, so those columns are read as plain strings instead.
+    text_columns = {name: pyarrow.string() for name in temporal_columns(file_path, read_options, parse_options)}
+    with open_csv_stream(file_path) as (stream, raw):
+        table = arrow_csv.read_csv(
+            stream,
+            read_options=read_options,
+            parse_options=parse_options,
+            convert_options=pandas_convert_options(column_types=text_columns),
+        )
+    if short_rows or len(set(table.column_names)) != len(table.column_names):
+        return None
+    if any(is_temporal(column.type) for column in table.columns):
+        return None  # A date column the first block didn't show, let pandas read it
+    if any(overflows_int64(column) for column in table.columns):
+        return None  # Integers too big for int64 become floats in pyarrow, pandas keeps them exact (uint64)
+
+    df = table.to_pandas()
+    # Completely empty columns are float NaN in pandas
+    for name, column in zip(table.column_names, table.columns):
+        if pyarrow.types.is_null(column.type):
+            df[name] = float('nan')
+    return df
+
+def overflows_int64(column):
+    if not pyarrow.types.is_floating(column.type) or column.null_count == len(column):
+        return False
+    largest = pyarrow.compute.max(pyarrow.compute.abs(column)).as_py()
+    return largest is not None and largest >= 2 ** 63
+
+def read_csv(file_path):
+    """Parses the CSV file itself, without any cache."""
+    options = parse_options(file_path)
+    if options['engine'] == 'c' and arrow_csv is not None:
+        df = read_csv_with_pyarrow(file_path, options['sep'], options['encoding'])
+        if df is not None:
+            return df
+
+    if options['engine'] == 'c':
+        # Read whole columns at once so they get one consistent dtype
+        options['low_memory'] = False
+    with open_csv_stream(file_path) as (stream, raw):
+        return pd.read_csv(stream, **options)
+
+def read_columns(file_path):
+    """Returns the column names of a CSV file by reading only its header."""
+    with open_csv_stream(file_path) as (stream, raw):
+        return list(pd.read_csv(stream, **parse_options(file_path), nrows=0).columns)
+
+def iter_csv_chunks(file_path, chunksize, columns=None):
+    """
+    Parses the CSV file in chunks of chunksize rows, optionally only some columns.
+    Yields (chunk, fraction) where fraction is how much of the file has been read (0-1).
+    """
+    options = parse_options(file_path)
+    file_size = os.path.getsize(file_path) or 1
+    with open_csv_stream(file_path) as (stream, raw):
+        for chunk in pd.read_csv(stream, **options, usecols=columns, chunksize=chunksize):
+            yield chunk, min(raw.tell() / file_size, 1.0)
+
+def load_csv(file_path, columns=None, use_cache=True):
+    """
+    Loads a CSV export. The first time the file is parsed and a binary copy is
+    saved next to it, later loads of the same unchanged file read that copy instead.
+    """
+    if use_cache:
+        df = load_cached(file_path, columns)
+        if df is not None:
+            return df
+
+    df = read_csv(file_path)
+    if use_cache:
+        save_cache(file_path, df)
+    if columns is not None:
+        df = df[columns]
+    return df
+
+def benchmark(file_paths, repeat=3):
+    """Times the old python-engine autodetection against sniffing + the C/pyarrow parser (no cache)."""
+    def best_time(func):
+        best = None
+        for _ in range(repeat):
+            start = time.perf_counter()
+            result = func()
+            elapsed = time.perf_counter() - start
+            best = elapsed if best is None else min(best, elapsed)
+        return result, best
+
+    for file_path in file_paths:
+        def read_old():
+            with open_csv_stream(file_path) as (stream, raw):
+                return pd.read_csv(stream, **READ_OPTIONS)
+
+        old_df, old_time = best_time(read_old)
+        new_df, new_time = best_time(lambda: read_csv(file_path))
+        # The python engine keeps the byte order mark of UTF-8 files in the first column name
+        old_df = old_df.rename(columns=lambda name: name.lstrip('\ufeff'))
+        print(f"{file_path}: sniffed {sniff_format(file_path)}")
+        print(f"  python engine: {old_time:.3f} s  ({len(old_df)} rows)")
+        print(f"  sniffed:       {new_time:.3f} s  ({len(new_df)} rows)")
+        print(f"  speedup: {old_time / new_time:.1f}x")
+        # The faster reading must not change what the tools get (or what ends up in the cache)
+        pd.testing.assert_frame_equal(old_df, new_df)
+        print("  same DataFrame as the python engine")
+
+if __name__ == "__main__" and len(sys.argv) >= 2 and sys.argv[1] == "--benchmark":
+    samples = [path for path in sorted(glob.glob(os.path.join("CSV_files", "*")))
+               if path.lower().endswith((".csv", ".zip", ".gz", ".zst"))]
+    benchmark(sys.argv[2:] or samples)
+
+# This file is used by the other codes to load CSV files, you don't need to run it.
+# The codes can open the zipped CSV files directly (.zip, .gz and .zst), no need to unzip them first.
+# To see how much faster the loading is: python csv_loader.py --benchmark yourfile.csv
+# (without a file it uses the CSV files in the CSV_files folder)
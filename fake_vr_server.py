@@ -0,0 +1,156 @@
+import email.utils
+import hashlib
+import os
+import sys
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from urllib.parse import parse_qs, urlsplit
+
+# The saved pages the server answers with
+FIXTURES_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), "html_fixtures")
+LIST_PATH = "/english/applying-for-funding/calls-and-decisions.html"
+CALL_PATH_PREFIX = "/english/applying-for-funding/calls/"
+
+class FakeVRHandler(BaseHTTPRequestHandler):
+    """
+    Answers like www.vr.se for the pages the scrapers use:
+    the calls list (calls_page1.html, ?page=2 -> calls_page2.html ...) and the call pages (calls/<name>.html).
+    """
+    def do_GET(self):
+        parts = urlsplit(self.path)
+        with self.server.lock:
+            self.server.request_log.append(self.path)
+            # A flaky server: the first tries of every page fail, so retries can be tested
+            # (keyed by the full path, ?page=2 is another page than ?page=1)
+            failures = self.server.failures.get(self.path, 0)
+            if failures < self.server.fail_first:
+                self.server.failures[self.path] = failures + 1
+        if failures < self.server.fail_first:
+            self.send_error(503)
+            return
+        time.sleep(self.server.delay)  # A slow server, so concurrency can be tested
+
+        if parts.path == LIST_PATH:
+            page = parse_qs(parts.query).get("page", ["1"])[0]
+            file_path = os.path.join(self.server.fixtures_dir, f"calls_page{page}.html")
+        elif parts.path.startswith(CALL_PATH_PREFIX):
+            name = os.path.basename(parts.path)  # basename: no way out of the fixtures folder
+            file_path = os.path.join(self.server.fixtures_dir, "calls", name)
+        else:
+            file_path = None
+
+        if file_path is None or not os.path.isfile(file_path):
+            self.send_error(404)
+            return
+
+        with open(file_path, "rb") as f:
+            body = f.read()
+        # Like a real web server: validators, so a client can ask "only if it changed"
+        etag = '"' + hashlib.sha1(body).hexdigest()[:16] + '"'
+        last_modified = email.utils.formatdate(int(os.path.getmtime(file_path)), usegmt=True)
+        if self.not_modified(etag, last_modified):
+            self.send_response(304)
+            self.send_header("ETag", etag)
+            self.send_header("Last-Modified", last_modified)
+            self.end_headers()
+            return
+
+        self.send_response(200)
+        self.send_header("Content-Type", "text/html; charset=utf-8")
+        self.send_header("Content-Length", str(len(body)))
+        if self.server.validators:
+            self.send_header("ETag", etag)
+            self.send_header("Last-Modified", last_modified)
+        self.end_headers()
+        self.wfile.write(body)
+
+    def not_modified(self, etag, last_modified):
+        if not self.server.validators:
+            return False
+        if_none_match = self.headers.get("If-None-Match")
+        if if_none_match is not None:
+            return etag in [tag.strip() for tag in if_none_match.split(",")]
+        if_modified_since = self.headers.get("If-Modified-Since")
+        if if_modified_since is not None:
+            try:
+                return (email.utils.parsedate_to_datetime(last_modified)
+                        <= email.utils.parsedate_to_datetime(if_modified_since))
+            except (TypeError, ValueError):
+                return False
+        return False
+
+    def send_response(self, code, message=None):
+        with self.server.lock:
+            self.server.status_log.append((self.path, code))
+        super().send_response(code, message)
+
+    def log_message(self, format, *args):
+        pass  # Keep the test output clean
+
+class FakeVRServer:
+    """
+    A local stand-in for www.vr.se that serves the saved pages in html_fixtures,
+    so the scrapers can be tried without internet. Runs in a background thread:
+
+        with FakeVRServer() as server:
+            calls, complete = fetch_open_calls_http(list_url=server.list_url)
+    """
+    def __init__(self, port=0, fixtures_dir=FIXTURES_DIR, delay=0.0, fail_first=0, validators=True):
+        self.httpd = ThreadingHTTPServer(("127.0.0.1", port), FakeVRHandler)
+        self.httpd.daemon_threads = True
+        self.httpd.fixtures_dir = fixtures_dir
+        self.httpd.delay = delay  # Seconds before every answer
+        self.httpd.fail_first = fail_first  # Answer 503 this many times per page before answering properly
+        self.httpd.failures = {}
+        self.httpd.validators = validators  # Send ETag / Last-Modified and answer conditional requests with 304
+        self.httpd.lock = threading.Lock()
+        self.httpd.request_log = []  # Every path that was asked for, to check what the scrapers fetched
+        self.httpd.status_log = []  # (path, status code) of every answer, e.g. to count the 304s
+        self.thread = None
+
+    @property
+    def base_url(self):
+        host, port = self.httpd.server_address[:2]
+        return f"http://{host}:{port}"
+
+    @property
+    def list_url(self):
+        return self.base_url + LIST_PATH + "?filters=callsOpen;&selectedSubject=all"
+
+    @property
+    def request_log(self):
+        return self.httpd.request_log
+
+    @property
+    def status_log(self):
+        return self.httpd.status_log
+
+    def start(self):
+        self.thread = threading.Thread(target=self.httpd.serve_forever, daemon=True)
+        self.thread.start()
+        return self
+
+    def stop(self):
+        self.httpd.shutdown()
+        self.httpd.server_close()
+        if self.thread:
+            self.thread.join()
+
+    def __enter__(self):
+        return self.start()
+
+    def __exit__(self, *exc_info):
+        self.stop()
+
+if __name__ == "__main__":
+    server = FakeVRServer(port=int(sys.argv[1]) if len(sys.argv) > 1 else 8000)
+    print(f"Serving the saved VR pages on {server.base_url}, list page: {server.list_url}")
+    print("Press Ctrl+C to stop.")
+    try:
+        server.httpd.serve_forever()
+    except KeyboardInterrupt:
+        server.httpd.server_close()
+
+# Start it with: python fake_vr_server.py (or python fake_vr_server.py 8080 for another port)
+# then try the scraper against it: python open_calls.py --http --url "http://127.0.0.1:8000/english/applying-for-funding/calls-and-decisions.html?filters=callsOpen;&selectedSubject=all"
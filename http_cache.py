@@ -0,0 +1,203 @@
+import hashlib
+import json
+import os
+import threading
+import time
+import requests
+from requests.structures import CaseInsensitiveDict
+
+# Folder next to the codes where the downloaded pages are kept
+CACHE_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), ".http_cache")
+# A page younger than this (seconds) is used without asking the server at all
+DEFAULT_TTL = 60 * 60
+# The cache never grows past this, the pages not used for the longest time are removed first
+DEFAULT_MAX_BYTES = 50 * 1024 * 1024
+
+class HTTPCache:
+    """
+    Keeps downloaded pages on disk, keyed by URL, together with the ETag and
+    Last-Modified the server sent. A page younger than ttl seconds is returned
+    without any network traffic. An older page is revalidated with a conditional
+    request, so if it hasn't changed the server only answers "304 Not Modified".
+    """
+    def __init__(self, cache_dir=CACHE_DIR, ttl=DEFAULT_TTL, max_bytes=DEFAULT_MAX_BYTES):
+        self.cache_dir = cache_dir
+        self.ttl = ttl
+        self.max_bytes = max_bytes
+        self.lock = threading.Lock()  # The scrapers fetch from several threads
+        self.counts = {"hits": 0, "revalidated": 0, "misses": 0, "evicted": 0}
+        os.makedirs(cache_dir, exist_ok=True)
+        self.total_bytes = sum(os.path.getsize(path) for path in self.body_paths())
+
+    def paths_for(self, url):
+        key = hashlib.sha1(url.encode("utf-8")).hexdigest()
+        base = os.path.join(self.cache_dir, key)
+        return base + ".json", base + ".body"
+
+    def body_paths(self):
+        return [os.path.join(self.cache_dir, name) for name in os.listdir(self.cache_dir) if name.endswith(".body")]
+
+    def load(self, url):
+        """Returns (meta, body) for a cached URL, or None."""
+        meta_path, body_path = self.paths_for(url)
+        try:
+            with open(meta_path, "r", encoding="utf-8") as f:
+                meta = json.load(f)
+            with open(body_path, "rb") as f:
+                body = f.read()
+        except (OSError, ValueError):
+            return None
+        return (meta, body) if meta.get("url") == url else None
+
+    def get(self, url, fetch):
+        """
+        Returns the response for url from the cache or from the server.
+        fetch(headers) must do the actual GET request with the extra headers given.
+        """
+        cached = self.load(url)
+        if cached is not None:
+            meta, body = cached
+            if time.time() - meta["stored_at"] < self.ttl:
+                self.count("hits")
+                self.touch(url)
+                return self.make_response(url, meta, body)
+
+        headers = {}
+        if cached is not None:
+            # Ask the server to only send the page if it has changed
+            if meta.get("etag"):
+                headers["If-None-Match"] = meta["etag"]
+            if meta.get("last_modified"):
+                headers["If-Modified-Since"] = meta["last_modified"]
+        response = fetch(headers)
+
+        if response.status_code == 304 and cached is not None:
+            self.count("revalidated")
+            meta["stored_at"] = time.time()
+            meta["etag"] = response.headers.get("ETag", meta.get("etag"))
+            meta["last_modified"] = response.headers.get("Last-Modified", meta.get("last_modified"))
+            self.write_meta(url, meta)
+            self.touch(url)
+            return self.make_response(url, meta, body)
+
+        self.count("misses")
+        if response.status_code == 200 and "no-store" not in response.headers.get("Cache-Control", ""):
+            self.store(url, response)
+        return response
+
+    def store(self, url, response):
+        """Saves a page. Failing to cache is not an error."""
+        meta = {
+            "url": url,
+            "stored_at": time.time(),
+            "etag": response.headers.get("ETag"),
+            "last_modified": response.headers.get("Last-Modified"),
+            "content_type": response.headers.get("Content-Type"),
+            "encoding": response.encoding,
+        }
+        meta_path, body_path = self.paths_for(url)
+        body = response.content
+        try:
+            old_size = os.path.getsize(body_path) if os.path.exists(body_path) else 0
+            tmp_path = f"{body_path}.{threading.get_ident()}.tmp"
+            with open(tmp_path, "wb") as f:
+                f.write(body)
+            os.replace(tmp_path, body_path)
+            self.write_meta(url, meta)
+        except OSError:
+            return
+        with self.lock:
+            self.total_bytes += len(body) - old_size
+        self.evict()
+
+    def write_meta(self, url, meta):
+        meta_path, body_path = self.paths_for(url)
+        tmp_path = f"{meta_path}.{threading.get_ident()}.tmp"
+        with open(tmp_path, "w", encoding="utf-8") as f:
+            json.dump(meta, f)
+        os.replace(tmp_path, meta_path)
+
+    def touch(self, url):
+        # The modification time of the body is when the page was last used (for the eviction)
+        try:
+            os.utime(self.paths_for(url)[1])
+        except OSError:
+            pass
+
+    def evict(self):
+        """Removes the least recently used pages until the cache fits in max_bytes."""
+        with self.lock:
+            if self.total_bytes <= self.max_bytes:
+                return
+            entries = []
+            for body_path in self.body_paths():
+                try:
+                    stat = os.stat(body_path)
+                except OSError:
+                    continue
+                entries.append((stat.st_mtime, stat.st_size, body_path))
+            for mtime, size, body_path in sorted(entries):
+                if self.total_bytes <= self.max_bytes:
+                    break
+                for path in (body_path, body_path[:-len(".body")] + ".json"):
+                    try:
+                        os.remove(path)
+                    except OSError:
+                        pass
+                self.total_bytes -= size
+                self.counts["evicted"] += 1
+
+    def make_response(self, url, meta, body):
+        """A requests Response built from a cached page, so the callers can't tell the difference."""
+        response = requests.Response()
+        response.status_code = 200
+        response.url = url
+        response._content = body
+        response.encoding = meta.get("encoding")
+        response.headers = CaseInsensitiveDict({name: value for name, value in (
+            ("Content-Type", meta.get("content_type")), ("ETag", meta.get("etag")),
+            ("Last-Modified", meta.get("last_modified"))) if value})
+        response.from_cache = True
+        return response
+
+    def count(self, name):
+        with self.lock:
+            self.counts[name] += 1
+
+    def clear(self):
+        with self.lock:
+            for name in os.listdir(self.cache_dir):
+                try:
+                    os.remove(os.path.join(self.cache_dir, name))
+                except OSError:
+                    pass
+            self.total_bytes = 0
+
+    def stats(self):
+        """Hits (no network), revalidated (304), misses (downloaded), evicted pages, size and hit rate."""
+        with self.lock:
+            stats = dict(self.counts, bytes=self.total_bytes)
+        requests_made = stats["hits"] + stats["revalidated"] + stats["misses"]
+        stats["hit_rate"] = (stats["hits"] + stats["revalidated"]) / requests_made if requests_made else 0.0
+        return stats
+
+    def stats_text(self):
+        stats = self.stats()
+        return (f"HTTP cache: {stats['hits']} from disk, {stats['revalidated']} unchanged (304), "
+                f"{stats['misses']} downloaded, {stats['evicted']} evicted, "
+                f"{stats['bytes'] / 1024:.0f} KB, hit rate {stats['hit_rate']:.0%}")
+
+class CachedSession(requests.Session):
+    """A requests session whose GET requests go through an HTTPCache."""
+    def __init__(self, cache):
+        super().__init__()
+        self.cache = cache
+
+    def get(self, url, **kwargs):
+        def fetch(extra_headers):
+            headers = dict(kwargs.get("headers") or {}, **extra_headers)
+            return requests.Session.get(self, url, **dict(kwargs, headers=headers))
+        return self.cache.get(url, fetch)
+
+# This file is used by open_calls.py and user_open_calls.py, you don't need to run it.
+# It keeps the downloaded VR pages in a .http_cache folder, delete that folder any time to start over.
@@ -1,10 +1,84 @@
+import sys
+from collections import OrderedDict
+import numpy as np
 import pandas as pd
 import tkinter as tk
 from tkinter import filedialog, ttk, messagebox, Toplevel
-from pandastable import Table
-import threading
 from sklearn.feature_extraction.text import TfidfVectorizer
 import tkinter.font as tkFont
+import csv_loader
+from virtual_table import VirtualTable
+from tk_worker import BackgroundTask
+from project_index import KeywordIndex, SearchIndex
+
+# "virtual" only draws the rows you can see (fast for 100k+ rows),
+# "pandastable" is the old table that draws the whole DataFrame
+TABLE_MODE = "virtual"
+
+def compute_sort_order(data, column):
+    """
+    Returns (order, valid_count): the row positions of data sorted ascending by
+    a column (stable, empty values last) and how many values are not empty.
+    Only reads data, so it is safe to run in a worker thread.
+    """
+    values = data[column].reset_index(drop=True)
+    order = values.sort_values(kind='stable', na_position='last').index.to_numpy()
+    return order, int(values.notna().sum())
+
+def compute_descending_order(data, column, order, valid_count):
+    """
+    The descending order made from the ascending one of compute_sort_order: the runs of
+    equal values are reversed, but the rows inside a run keep their file order
+    (stable, like sort_values(ascending=False, kind='stable')). Empty values stay last.
+    """
+    valid = order[:valid_count]
+    values = data[column].to_numpy()[valid]
+    # Number the runs of equal values in ascending order, then put the last run first
+    run = np.concatenate([[0], np.cumsum(values[1:] != values[:-1])]) if valid_count else np.zeros(0, dtype=int)
+    return np.concatenate([valid[np.argsort(-run, kind='stable')], order[valid_count:]])
+
+class DetailCache:
+    """
+    Bounded LRU cache for the formatted details of projects, keyed by row position.
+    It is limited both by the number of entries and by the (approximate) memory
+    of the stored texts, the least recently used entries are dropped first.
+    """
+    def __init__(self, max_entries=500, max_bytes=20 * 1024 * 1024):
+        self.max_entries = max_entries
+        self.max_bytes = max_bytes
+        self.entries = OrderedDict()  # key -> (value, size in bytes)
+        self.total_bytes = 0
+        self.hits = 0
+        self.misses = 0
+
+    def get(self, key):
+        if key in self.entries:
+            self.entries.move_to_end(key)
+            self.hits += 1
+            return self.entries[key][0]
+        self.misses += 1
+        return None
+
+    def put(self, key, value):
+        size = sum(sys.getsizeof(part) for part in value)
+        if key in self.entries:
+            self.total_bytes -= self.entries.pop(key)[1]
+        self.entries[key] = (value, size)
+        self.total_bytes += size
+        while self.entries and (len(self.entries) > self.max_entries or self.total_bytes > self.max_bytes):
+            _, (_, old_size) = self.entries.popitem(last=False)
+            self.total_bytes -= old_size
+
+    def clear(self):
+        self.entries.clear()
+        self.total_bytes = 0
+        self.hits = 0
+        self.misses = 0
+
+    def stats(self):
+        lookups = self.hits + self.misses
+        return {"hits": self.hits, "misses": self.misses, "entries": len(self.entries),
+                "bytes": self.total_bytes, "hit_rate": self.hits / lookups if lookups else 0.0}
 
 class CSVViewerApp:
     def __init__(self, root):
@@ -24,7 +98,21 @@ class CSVViewerApp:
         self.frame.pack(fill=tk.BOTH, expand=True)
         
         self.data = None  # Will hold the DataFrame
-        self.table = None  # Will hold the pandastable Table object
+        self.table = None  # Will hold the VirtualTable (or pandastable Table) object
+        self.view_order = None  # Row positions of self.data in the order they are shown
+        self.sorted_order = None  # Row positions in the current sort order (before searching)
+        self.search_index = None  # Inverted index over titles and abstracts, built after loading
+        self.search_task = None
+        self.search_results = None  # Matching row positions (best first), None when not searching
+        self.search_after_id = None
+        self.sort_cache = {}  # Column name -> (ascending row order, number of non-empty values)
+        self.descending_cache = {}  # Column name -> descending row order, made from the ascending one
+        self.last_sort_column = None
+        self.sort_task = None  # The sort running in the background, if any
+        self.keyword_index = None  # TF-IDF keywords for all projects, built after loading
+        self.index_task = None
+        self.detail_cache = DetailCache()  # Formatted details of recently opened projects
+        self.detail_windows = {}  # Row position -> open details window
         
         # Sorting Frame
         self.sorting_frame = tk.Frame(root)
@@ -42,26 +130,169 @@ class CSVViewerApp:
         self.sort_button = tk.Button(self.sorting_frame, text="Sort", command=self.sort_data)
         self.sort_button.pack(side=tk.LEFT, padx=5)
 
+        # Descending checkbox
+        self.descending_var = tk.BooleanVar(value=False)
+        self.descending_check = tk.Checkbutton(self.sorting_frame, text="Descending", variable=self.descending_var)
+        self.descending_check.pack(side=tk.LEFT, padx=5)
+
+        self.sort_status = tk.Label(self.sorting_frame, text="")
+        self.sort_status.pack(side=tk.LEFT, padx=5)
+
+        # Search Frame: filters the table while you type
+        self.search_frame = tk.Frame(root)
+        self.search_frame.pack(pady=5)
+        self.search_label = tk.Label(self.search_frame, text="Search:")
+        self.search_label.pack(side=tk.LEFT)
+        self.search_var = tk.StringVar()
+        self.search_entry = tk.Entry(self.search_frame, textvariable=self.search_var, width=50)
+        self.search_entry.pack(side=tk.LEFT, padx=5)
+        self.search_status = tk.Label(self.search_frame, text="")
+        self.search_status.pack(side=tk.LEFT, padx=5)
+        self.search_var.trace_add('write', self.on_search_changed)
+
     def load_csv(self):
-        file_path = filedialog.askopenfilename(filetypes=[("CSV Files", "*.csv")])
+        file_path = filedialog.askopenfilename(filetypes=csv_loader.FILE_TYPES)
         if not file_path:
             return
         
         try:
-            # Load the CSV file
-            self.data = pd.read_csv(file_path, sep=None, engine='python', encoding="utf-8", on_bad_lines='skip')
+            # Load the CSV file (from the binary cache if it was loaded before)
+            self.data = csv_loader.load_csv(file_path)
+            # A new file means the old sort orders are useless
+            self.cancel_sort()
+            self.view_order = np.arange(len(self.data))
+            self.sorted_order = self.view_order
+            self.search_results = None
+            self.sort_cache = {}
+            self.descending_cache = {}
+            self.last_sort_column = None
+            self.detail_cache.clear()
+            self.detail_windows = {}
             messagebox.showinfo("Success", "CSV file loaded successfully!")
             self.show_data()
+            self.build_keyword_index()
+            self.build_search_index()
         except Exception as e:
             messagebox.showerror("Error", f"Failed to load CSV file:\n{e}")
 
+    def build_keyword_index(self):
+        """Fits TF-IDF over all abstracts in the background, so opening a project is just a lookup."""
+        if self.index_task is not None:
+            self.index_task.cancel()
+        self.keyword_index = None
+        if 'ProjectAbstractEn' not in self.data.columns:
+            return
+
+        data = self.data
+        self.index_task = BackgroundTask(self.root, lambda task: KeywordIndex(data['ProjectAbstractEn']),
+                                         on_done=lambda index: self.on_keyword_index_done(data, index),
+                                         on_error=lambda error: print("Could not build the keyword index:", error))
+        self.index_task.start()
+
+    def on_keyword_index_done(self, data, index):
+        self.index_task = None
+        if data is self.data:  # Only if no other file was loaded meanwhile
+            self.keyword_index = index
+
+    def build_search_index(self):
+        """Builds the inverted index over titles and abstracts in the background."""
+        if self.search_task is not None:
+            self.search_task.cancel()
+        self.search_index = None
+        if 'ProjectTitleEn' not in self.data.columns and 'ProjectAbstractEn' not in self.data.columns:
+            self.search_status.config(text="")
+            return
+
+        data = self.data
+        empty = pd.Series([""] * len(data))
+        titles = data['ProjectTitleEn'] if 'ProjectTitleEn' in data.columns else empty
+        abstracts = data['ProjectAbstractEn'] if 'ProjectAbstractEn' in data.columns else empty
+        self.search_status.config(text="Indexing...")
+        self.search_task = BackgroundTask(self.root, lambda task: SearchIndex(titles, abstracts),
+                                          on_done=lambda index: self.on_search_index_done(data, index),
+                                          on_error=lambda error: self.search_status.config(text=f"Search unavailable: {error}"))
+        self.search_task.start()
+
+    def on_search_index_done(self, data, index):
+        self.search_task = None
+        if data is not self.data:  # Another file was loaded meanwhile
+            return
+        self.search_index = index
+        self.search_status.config(text="")
+        self.run_search()  # In case the user already typed something
+
+    def on_search_changed(self, *args):
+        # Wait until the user pauses typing for a moment
+        if self.search_after_id is not None:
+            self.root.after_cancel(self.search_after_id)
+        self.search_after_id = self.root.after(150, self.run_search)
+
+    def run_search(self):
+        self.search_after_id = None
+        if self.data is None or self.search_index is None:
+            return
+        self.search_results = self.search_index.search(self.search_var.get())
+        if self.search_results is None:
+            self.search_status.config(text="")
+        else:
+            self.search_status.config(text=f"{len(self.search_results)} matching projects")
+        self.update_view()
+
+    def update_view(self):
+        """Combines the current sort order and search results into the rows that are shown."""
+        if self.search_results is None:
+            self.view_order = self.sorted_order
+        elif self.last_sort_column is not None:
+            # Sorted by a column: keep that order, only show the matches
+            self.view_order = self.sorted_order[np.isin(self.sorted_order, self.search_results)]
+        else:
+            # Not sorted: best matches first
+            self.view_order = self.search_results
+
+        if isinstance(self.table, VirtualTable):
+            self.table.set_order(self.view_order)
+        else:
+            self.show_data()
+
     def show_data(self):
+        if TABLE_MODE == "virtual":
+            self.show_virtual_table()
+        else:
+            self.show_pandastable()
+
+    def show_virtual_table(self):
+        # The table is created once and then only gets new data, nothing is rebuilt
+        if not isinstance(self.table, VirtualTable):
+            for widget in self.frame.winfo_children():
+                widget.destroy()
+            self.table = VirtualTable(self.frame)
+            self.table.pack(fill=tk.BOTH, expand=True)
+            self.table.on_heading_click = self.sort_by_heading
+            self.table.bind_rows('<Double-Button-1>', self.on_row_double_click)
+        self.table.set_data(self.data, self.view_order)
+
+        if self.data is not None:
+            self.sort_dropdown['values'] = list(self.data.columns)
+
+    def sort_by_heading(self, column):
+        # Clicking the same heading again flips the direction
+        if column == self.last_sort_column:
+            self.descending_var.set(not self.descending_var.get())
+        else:
+            self.descending_var.set(False)
+        self.sort_var.set(column)
+        self.sort_data()
+
+    def show_pandastable(self):
+        from pandastable import Table  # Only needed for this mode
+
         # Clear any existing table from the frame
         for widget in self.frame.winfo_children():
             widget.destroy()
         
         # Create the pandastable table in read-only mode
-        self.table = Table(self.frame, dataframe=self.data, showtoolbar=False, showstatusbar=False, editable=False)
+        shown = self.data.iloc[self.view_order] if self.data is not None else None
+        self.table = Table(self.frame, dataframe=shown, showtoolbar=False, showstatusbar=False, editable=False)
         self.table.show()
 
         # Populate the dropdown with column names (only when data is loaded)
@@ -77,8 +308,10 @@ class CSVViewerApp:
         row = self.table.get_row_clicked(event)
         if row is not None:
             try:
-                project = self.data.iloc[row]
-                self.show_project_details(project)
+                # The virtual table gives the DataFrame position, pandastable the shown row number
+                position = row if isinstance(self.table, VirtualTable) else self.view_order[row]
+                project = self.data.iloc[position]
+                self.show_project_details(project, position)
             except Exception as e:
                 messagebox.showerror("Error", f"Failed to retrieve project details:\n{e}")
 
@@ -86,29 +319,74 @@ class CSVViewerApp:
         if self.data is None:
             return
         column = self.sort_var.get()
-        if column:
-            threading.Thread(target=self.perform_sort, args=(column,), daemon=True).start()
+        if not column:
+            return
+        ascending = not self.descending_var.get()
 
-    def perform_sort(self, column):
-        try:
-            self.data = self.data.sort_values(by=column, ascending=True)
-            # Refresh table with sorted data
-            self.show_data()
-        except Exception as e:
-            messagebox.showerror("Sorting Error", f"Failed to sort:\n{e}")
+        # A newer sort always wins: the result of a sort still running is thrown away
+        self.cancel_sort()
 
-    def show_project_details(self, project):
-        """Show project details in a new window with key information and a short NLP summary."""
-        details_window = Toplevel(self.root)
-        details_window.geometry("500x400")  # Default small size
-        
-        # Define base font sizes
-        base_title_size = 12
-        base_info_size = 10
+        if column in self.sort_cache:
+            self.apply_sort(column, ascending)
+            return
 
-        # Define fonts
-        title_font = tkFont.Font(family="Helvetica", size=base_title_size, weight="bold")
-        info_font = tkFont.Font(family="Helvetica", size=base_info_size)
+        # Sort in a worker, the result comes back to the Tk thread through the task's queue
+        data = self.data
+        self.sort_status.config(text="Sorting...")
+        self.sort_task = BackgroundTask(self.root, lambda task: compute_sort_order(data, column),
+                                        on_done=lambda result: self.on_sort_done(data, column, ascending, result),
+                                        on_error=self.on_sort_error).start()
+
+    def cancel_sort(self):
+        if self.sort_task is not None:
+            self.sort_task.cancel()
+            self.sort_task = None
+            self.sort_status.config(text="")
+
+    def on_sort_done(self, data, column, ascending, result):
+        self.sort_task = None
+        self.sort_status.config(text="")
+        if data is not self.data:  # A new file was loaded meanwhile
+            return
+        self.sort_cache[column] = result
+        self.apply_sort(column, ascending)
+
+    def on_sort_error(self, error):
+        self.sort_task = None
+        self.sort_status.config(text="")
+        messagebox.showerror("Sorting Error", f"Failed to sort:\n{error}")
+
+    def sort_order(self, column, ascending=True):
+        """
+        Returns the row positions of self.data sorted by a column. The ascending
+        order of each column is only computed once, descending is made from it
+        (on first use). Both are stable and empty values are always last.
+        """
+        if column not in self.sort_cache:
+            self.sort_cache[column] = compute_sort_order(self.data, column)
+
+        order, valid_count = self.sort_cache[column]
+        if ascending:
+            return order
+        if column not in self.descending_cache:
+            self.descending_cache[column] = compute_descending_order(self.data, column, order, valid_count)
+        return self.descending_cache[column]
+
+    def apply_sort(self, column, ascending=True):
+        # Only the view order changes, self.data itself stays the same
+        self.sorted_order = self.sort_order(column, ascending)
+        self.last_sort_column = column
+        self.update_view()
+
+    def project_details_text(self, project, position=None):
+        """
+        Returns (title, info_text) for a project. Results are cached by row position,
+        so opening the same project again doesn't redo the keyword summary.
+        """
+        if position is not None:
+            cached = self.detail_cache.get(position)
+            if cached is not None:
+                return cached
 
         # Retrieve project details
         title = project.get('ProjectTitleEn', 'N/A')
@@ -118,13 +396,48 @@ class CSVViewerApp:
             funding = f"{funding} SEK"  # Append SEK to show currency
         
         # Generate a keyword summary
-        summary = self.generate_summary(description) if description.strip() != "" and description != 'N/A' else "No summary available."
+        final = True
+        if description.strip() == "" or description == 'N/A':
+            summary = "No summary available."
+        elif self.keyword_index is not None and position is not None:
+            # Keywords from the TF-IDF fitted over all projects
+            summary = ', '.join(self.keyword_index.keywords(position)) or "No summary available."
+        else:
+            # The corpus index isn't ready yet, fall back to this abstract alone (not cached)
+            summary = self.generate_summary(description)
+            final = False
         
         # Prepare the information text
         info_text = f"Project Description:\n{description}\n\n"
         info_text += f"Funding Cost: {funding}\n\n"
         info_text += f"Keyword Summary: {summary}"
+
+        if final and position is not None:
+            self.detail_cache.put(position, (title, info_text))
+        return title, info_text
+
+    def show_project_details(self, project, position=None):
+        """Show project details in a new window with key information and a short NLP summary."""
+        # If this project's window is still open, just bring it to the front
+        open_window = self.detail_windows.get(position)
+        if open_window is not None and open_window.winfo_exists():
+            open_window.deiconify()
+            open_window.lift()
+            return
+
+        title, info_text = self.project_details_text(project, position)
+
+        details_window = Toplevel(self.root)
+        details_window.geometry("500x400")  # Default small size
         
+        # Define base font sizes
+        base_title_size = 12
+        base_info_size = 10
+
+        # Define fonts
+        title_font = tkFont.Font(family="Helvetica", size=base_title_size, weight="bold")
+        info_font = tkFont.Font(family="Helvetica", size=base_info_size)
+
         # Create title label
         title_label = tk.Label(details_window, text=title, font=title_font, justify=tk.CENTER)
         title_label.pack(pady=(15, 10))
@@ -145,6 +458,15 @@ class CSVViewerApp:
         
         details_window.bind("<Configure>", adjust_font)  # Bind the resize event
 
+        if position is not None:
+            self.detail_windows[position] = details_window
+
+            def forget_window(event):
+                if event.widget is details_window:
+                    self.detail_windows.pop(position, None)
+
+            details_window.bind("<Destroy>", forget_window, add="+")
+
     def generate_summary(self, text):
         """Generate a summary using TF-IDF to extract key keywords."""
         try:
@@ -167,5 +489,7 @@ if __name__ == "__main__":
     root.mainloop()
 
 # press the "load CSV file" button. then press ok on teh SUCCES window. then a window that is white will show up.
-# OBS! very important to scroll for som reason to make the data show up. then you can either use teh tab below to sort or press on the first row with titles that is dark gray to sort.
+# the data shows up right away (only the rows you see are drawn, so even huge files are fast). then you can either use teh tab below to sort or press on a column title to sort.
+# (set TABLE_MODE = "pandastable" at the top to get the old table back, then you have to scroll to make the data show up)
+# type in the Search field to only show the projects with those words in the title or description (best matches first).
 # a row represent one project, if you press any row/project it will give you another window with some extra information about the project. for full text make it full screen.
\ No newline at end of file
@@ -0,0 +1,97 @@
+# The NLTK data the text tools use: download name -> path nltk.data.find looks for
+RESOURCES = {
+    "punkt_tab": "tokenizers/punkt_tab/english/",  # word_tokenize
+    "stopwords": "corpora/stopwords",
+    "wordnet": "corpora/wordnet",
+}
+
+class MissingResourceError(LookupError):
+    """Raised when an NLTK resource is not installed and may not be downloaded."""
+
+class NLTKResources:
+    """
+    Loads NLTK and its data only when a tool actually needs them, instead of on import.
+    Nothing is downloaded unless allow_download is set, and in offline mode a missing
+    resource is reported right away with a message that says how to get it.
+    """
+    def __init__(self, offline=False, allow_download=False):
+        self.offline = offline
+        self.allow_download = allow_download
+        self.ready = set()  # Resources that have been found (or downloaded) already
+        self._stopwords = {}
+        self._sentence_tokenizers = {}
+        self._word_tokenizer = None
+
+    def is_installed(self, name):
+        import nltk.data  # Importing nltk takes about a second, so it is done here and not at the top
+        try:
+            nltk.data.find(RESOURCES[name])
+            return True
+        except LookupError:
+            return False
+
+    def missing(self):
+        return [name for name in RESOURCES if not self.is_installed(name)]
+
+    def ensure(self, name):
+        """Makes sure a resource is available, downloading it only if that is allowed."""
+        if name in self.ready:
+            return
+        if not self.is_installed(name):
+            if self.offline or not self.allow_download:
+                raise MissingResourceError(self.missing_message([name]))
+            import nltk
+            if not nltk.download(name, quiet=True) or not self.is_installed(name):
+                raise MissingResourceError(f"Downloading the NLTK resource '{name}' failed.")
+        self.ready.add(name)
+
+    def ensure_all(self):
+        """Checks (or downloads) every resource up front, so a batch fails before it starts."""
+        missing = [name for name in RESOURCES if name not in self.ready and not self.is_installed(name)]
+        if missing and (self.offline or not self.allow_download):
+            raise MissingResourceError(self.missing_message(missing))
+        for name in RESOURCES:
+            self.ensure(name)
+
+    def missing_message(self, names):
+        import nltk.data
+        mode = "Offline mode: " if self.offline else ""
+        return (f"{mode}NLTK data not installed: {', '.join(names)}.\n"
+                f"Run once with internet: python texttester.py --download-nltk\n"
+                f"(or copy an nltk_data folder to one of: {', '.join(nltk.data.path)})")
+
+    def word_tokenize(self, text):
+        self.ensure("punkt_tab")
+        from nltk.tokenize import word_tokenize
+        return word_tokenize(text)
+
+    def sentence_tokenizer(self, language='english'):
+        """The Punkt sentence splitter word_tokenize uses (loaded once)."""
+        if language not in self._sentence_tokenizers:
+            self.ensure("punkt_tab")
+            from nltk.tokenize import PunktTokenizer
+            self._sentence_tokenizers[language] = PunktTokenizer(language)
+        return self._sentence_tokenizers[language]
+
+    def word_tokenizer(self):
+        """The tokenizer word_tokenize runs on each sentence (needs no data)."""
+        if self._word_tokenizer is None:
+            from nltk.tokenize import NLTKWordTokenizer
+            self._word_tokenizer = NLTKWordTokenizer()
+        return self._word_tokenizer
+
+    def stopwords(self, language='english'):
+        """The stopword list of a language (read from disk once)."""
+        if language not in self._stopwords:
+            self.ensure("stopwords")
+            from nltk.corpus import stopwords
+            self._stopwords[language] = stopwords.words(language)
+        return self._stopwords[language]
+
+    def wordnet(self):
+        self.ensure("wordnet")
+        from nltk.corpus import wordnet
+        return wordnet
+
+# This file is used by texttester.py, you don't need to run it.
+# It makes sure the NLTK data is only loaded when it is needed and never downloaded by surprise.
@@ -1,12 +1,17 @@
+import argparse
 import time
-from selenium import webdriver
-from selenium.webdriver.common.by import By
-from selenium.webdriver.chrome.service import Service
-from selenium.webdriver.chrome.options import Options
-from webdriver_manager.chrome import ChromeDriverManager
-from bs4 import BeautifulSoup
+import call_store
+import http_cache
+import vr_scraping
 
 def fetch_open_calls():
+    # Selenium is only needed for this browser mode, not for --http
+    from selenium import webdriver
+    from selenium.webdriver.common.by import By
+    from selenium.webdriver.chrome.service import Service
+    from selenium.webdriver.chrome.options import Options
+    from webdriver_manager.chrome import ChromeDriverManager
+
     # Set up Chrome options
     chrome_options = Options()
     chrome_options.add_argument("--headless")  # Run headless (without opening browser window)
@@ -38,38 +43,93 @@ def fetch_open_calls():
 
     # After loading all content, extract the links
     print("Extracting links after all content is loaded...")
-    soup = BeautifulSoup(driver.page_source, 'html.parser')
-    links = soup.find_all("a", href=True)
+    # Only the call links and their dates are read from the page (lxml + XPath, see vr_scraping.py)
+    project_details = vr_scraping.parse_call_links(driver.page_source)
 
-    # Filter out the links that point to open calls (based on their structure)
-    call_links = [link for link in links if link['href'].startswith('/english/applying-for-funding/calls/')]
-    
-    # Collect and display the project details
-    project_details = []
-    for link in call_links:
-        full_url = f"https://www.vr.se{link['href']}"
-        title = link.get_text(strip=True)
-        
-        # Extract the date (can be tricky depending on the exact structure, adjusting as needed)
-        date_text = link.find_parent("div").find("p", class_="content__list__text__date").text.strip() if link.find_parent("div") else "No date"
-        
-        project_details.append({
-            "Title": title,
-            "Link": full_url,
-            "Date": date_text
-        })
+    print_project_details(project_details)
+
+    # Close the browser
+    driver.quit()
+    return project_details
+
+def fetch_open_calls_http(list_url=vr_scraping.LIST_URL, page_parameter=vr_scraping.PAGE_PARAMETER, cache=None):
+    """
+    The same list without a browser: the pages of the list are fetched directly
+    over HTTP (one kept-alive session) until there is no "Show more" button left.
+    With a cache, pages that haven't changed since the last run are not downloaded again.
+    Returns (calls, complete), complete is True if the last page of the list was reached.
+    """
+    session = vr_scraping.make_session(cache=cache)
+    project_details, complete = vr_scraping.fetch_open_calls_http(session, list_url, page_parameter)
+    print_project_details(project_details)
+    if not complete:
+        print("Did not reach the end of the list, calls missing from it are not marked as closed.")
+    return project_details, complete
 
+def update_call_store(project_details, fetch_subjects=False, cache=None, db_path=call_store.DB_PATH,
+                      complete=False):
+    """
+    Compares the calls with the ones from the last run and saves them.
+    Calls are only marked as closed if project_details is the complete list.
+    With fetch_subjects, the subject area is fetched only for the calls that are
+    new or changed, the others are already in the store.
+    """
+    store = call_store.CallStore(db_path)
+    call_diff = store.update(project_details, complete)
+    call_store.print_call_diff(call_diff)
+
+    if fetch_subjects:
+        links = [project["Link"] for project in project_details]
+        to_fetch = store.links_needing_subject(links)
+        session = vr_scraping.make_session(pool_size=vr_scraping.MAX_CONCURRENT_REQUESTS, cache=cache)
+        for url, subject_area, error in vr_scraping.fetch_subject_areas(to_fetch, session):
+            if error is None:
+                store.set_subject_area(url, subject_area)
+            else:
+                print(f"Could not load {url}: {error}")
+        print(f"Fetched the subject area of {len(to_fetch)} calls, {len(links) - len(to_fetch)} were already known.")
+        subject_areas = store.subject_areas(links)
+        for project in project_details:
+            subject_area = subject_areas.get(project["Link"])
+            if subject_area:
+                print(f"{project['Title']}: {subject_area}")
+    store.close()
+    return call_diff
+
+def print_project_details(project_details):
     # Print the project details and count the open calls
     print(f"Found {len(project_details)} open calls:")
     for project in project_details:
         print(f"Title: {project['Title']}\nLink: {project['Link']}\nDate: {project['Date']}\n")
 
-    # Close the browser
-    driver.quit()
-
 if __name__ == "__main__":
-    fetch_open_calls()
+    parser = argparse.ArgumentParser(description="List the open calls on vr.se")
+    parser.add_argument("--http", action="store_true", help="fetch the list pages directly, without Chrome")
+    parser.add_argument("--url", default=vr_scraping.LIST_URL, help="list page to start from (for --http)")
+    parser.add_argument("--page-param", default=vr_scraping.PAGE_PARAMETER,
+                        help="query parameter for the page number (for --http)")
+    parser.add_argument("--no-cache", action="store_true", help="always download the pages")
+    parser.add_argument("--cache-ttl", type=float, default=http_cache.DEFAULT_TTL,
+                        help="seconds a saved page is used without asking the website")
+    parser.add_argument("--no-store", action="store_true", help="don't compare with (and save to) the calls of earlier runs")
+    parser.add_argument("--subjects", action="store_true", help="also get the subject area of new and changed calls")
+    args = parser.parse_args()
+    cache = None if args.no_cache else http_cache.HTTPCache(ttl=args.cache_ttl)
+    if args.http:
+        project_details, complete = fetch_open_calls_http(args.url, args.page_param, cache)
+    else:
+        project_details, complete = fetch_open_calls(), False  # Chrome may not get past the first pages
+    if not args.no_store:
+        update_call_store(project_details, args.subjects, cache, complete=complete)
+    if cache is not None:
+        print(cache.stats_text())
 
 # it should be just as easy as just running the code and find all the open calls.
 # BUT, this can't press the "Show more open calls" button to find ALL open calls project right now. 
 # so we only get a small portion of all open calls 
+# python open_calls.py --http does not use Chrome at all, it asks the website for page 1, 2, 3... of the list
+# until there are no more, so it finds all of them (and much faster). No Chrome or Selenium needed for that.
+# the pages are saved in a .http_cache folder, the next run only asks the website if they changed (--no-cache to turn it off).
+# every run is compared with the last one (saved in open_calls.sqlite): it prints which calls are new, changed or closed.
+# add --subjects to also get the subject area of each call, only the new and changed ones are downloaded for that.
+# to try it without internet, start python fake_vr_server.py and use the --url it prints.
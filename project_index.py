@@ -0,0 +1,82 @@
+import bisect
+import numpy as np
+from sklearn.feature_extraction.text import CountVectorizer, TfidfVectorizer
+
+class KeywordIndex:
+    """
+    TF-IDF keywords for every project, fitted once over all abstracts.
+    Because the IDF comes from the whole corpus, the keywords of a project are
+    the words that are common in its abstract but rare in the other abstracts.
+    """
+    def __init__(self, texts, max_df=1.0):
+        texts = texts.fillna("").astype(str)
+        self.vectorizer = TfidfVectorizer(stop_words='english', max_df=max_df)
+        self.matrix = self.vectorizer.fit_transform(texts).tocsr()  # One row per project
+        self.feature_names = self.vectorizer.get_feature_names_out()
+
+    def keywords(self, position, top_n=10):
+        """Returns the top keywords of the project at a row position, best first."""
+        # Only the non-zero entries of that one row are looked at
+        start, end = self.matrix.indptr[position], self.matrix.indptr[position + 1]
+        scores = self.matrix.data[start:end]
+        columns = self.matrix.indices[start:end]
+        best = np.argsort(-scores, kind='stable')[:top_n]
+        return [self.feature_names[column] for column in columns[best]]
+
+class SearchIndex:
+    """
+    Inverted index over project titles and abstracts, built once after loading.
+    A query only reads the posting lists of its words (columns of a sparse matrix),
+    so the DataFrame is never scanned again while the user types.
+    """
+    def __init__(self, titles, abstracts, title_weight=3.0):
+        titles = titles.fillna("").astype(str).tolist()
+        abstracts = abstracts.fillna("").astype(str).tolist()
+        row_count = len(titles)
+
+        # One pass over titles followed by abstracts gives both with the same vocabulary
+        self.vectorizer = CountVectorizer(token_pattern=r"(?u)\b\w+\b", dtype=np.float32)
+        counts = self.vectorizer.fit_transform(titles + abstracts).tocsr()
+        weighted = counts[:row_count] * title_weight + counts[row_count:]
+
+        # Words found in few projects count more (same idf formula as TfidfVectorizer)
+        document_counts = np.bincount(weighted.indices, minlength=weighted.shape[1])
+        self.idf = np.log((1 + row_count) / (1 + document_counts)) + 1
+
+        self.postings = weighted.tocsc()  # Column j = the projects that contain word j
+        self.words = self.vectorizer.get_feature_names_out().tolist()  # Sorted, so prefixes are ranges
+        self.analyzer = self.vectorizer.build_analyzer()
+        self.row_count = row_count
+
+    def word_columns(self, word, prefix=False):
+        """Returns the (start, end) range of vocabulary columns for a word, or for all words starting with it."""
+        start = bisect.bisect_left(self.words, word)
+        if prefix:
+            return start, bisect.bisect_left(self.words, word + "\uffff")
+        if start < len(self.words) and self.words[start] == word:
+            return start, start + 1
+        return start, start
+
+    def search(self, query):
+        """
+        Returns the row positions of the projects that contain every word of the query,
+        best match first. The last word may be incomplete (it matches as a prefix),
+        which is what you want while typing. Returns None for an empty query.
+        """
+        words = self.analyzer(query)
+        if not words:
+            return None
+
+        scores = np.zeros(self.row_count, dtype=np.float32)
+        matched = np.ones(self.row_count, dtype=bool)
+        for i, word in enumerate(words):
+            is_last = i == len(words) - 1
+            start, end = self.word_columns(word, prefix=is_last and not query[-1].isspace())
+            if start == end:
+                return np.arange(0)
+            word_scores = self.postings[:, start:end] @ self.idf[start:end]
+            matched &= word_scores > 0
+            scores += word_scores
+
+        positions = np.flatnonzero(matched)
+        return positions[np.argsort(-scores[positions], kind='stable')]
@@ -0,0 +1,115 @@
+import os
+import tempfile
+import unittest
+import call_store
+import http_cache
+import vr_scraping
+from fake_vr_server import FakeVRServer
+
+# What the saved pages in html_fixtures contain
+FIXTURE_CALLS = 13
+FIXTURE_PAGES = 3
+
+class ScrapingTest(unittest.TestCase):
+    """The HTTP scraper and the page cache against the saved VR pages (no internet needed)."""
+    def setUp(self):
+        self.cache_dir = tempfile.TemporaryDirectory()
+        self.addCleanup(self.cache_dir.cleanup)
+
+    def start_server(self, **options):
+        server = FakeVRServer(**options).start()
+        self.addCleanup(server.stop)
+        return server
+
+    def fetch_calls(self, server, cache=None):
+        session = vr_scraping.make_session(cache=cache)
+        return vr_scraping.fetch_open_calls_http(session, server.list_url)
+
+    def list_answers(self, server, start=0):
+        return [code for path, code in server.status_log[start:] if "calls-and-decisions" in path]
+
+    def test_pagination(self):
+        server = self.start_server()
+        calls, complete = self.fetch_calls(server)
+        self.assertEqual(len(calls), FIXTURE_CALLS)
+        self.assertEqual(len({call["Link"] for call in calls}), FIXTURE_CALLS)
+        self.assertTrue(complete)
+        self.assertEqual(self.list_answers(server), [200] * FIXTURE_PAGES)
+        # The links point at the server the list came from
+        self.assertTrue(all(call["Link"].startswith(server.base_url) for call in calls))
+
+    def test_max_pages_is_not_complete(self):
+        server = self.start_server()
+        calls, complete = vr_scraping.fetch_open_calls_http(vr_scraping.make_session(), server.list_url, max_pages=2)
+        self.assertLess(len(calls), FIXTURE_CALLS)
+        self.assertFalse(complete)
+
+    def test_empty_first_page_is_not_complete(self):
+        # E.g. an error page answered with 200, or a redesign the selectors don't match
+        with tempfile.TemporaryDirectory() as fixtures_dir:
+            with open(os.path.join(fixtures_dir, "calls_page1.html"), "w", encoding="utf-8") as f:
+                f.write("<html><body><p>Something went wrong, please try again later.</p></body></html>")
+            server = self.start_server(fixtures_dir=fixtures_dir)
+            calls, complete = self.fetch_calls(server)
+        self.assertEqual(calls, [])
+        self.assertFalse(complete)
+
+        # So the stored calls are not marked as closed
+        store = call_store.CallStore(os.path.join(self.cache_dir.name, "calls.sqlite"))
+        self.addCleanup(store.close)
+        store.update([dict(Title="A call", Link="https://www.vr.se/a-call.html", Date="2026-01-01")], complete=True)
+        self.assertEqual(store.update(calls, complete).closed, [])
+
+    def test_retry(self):
+        server = self.start_server(fail_first=1)
+        calls, complete = self.fetch_calls(server)
+        self.assertEqual(len(calls), FIXTURE_CALLS)
+        self.assertTrue(complete)
+        # Every page failed once and was asked for again
+        self.assertEqual(self.list_answers(server), [503, 200] * FIXTURE_PAGES)
+
+    def test_ttl_hit(self):
+        server = self.start_server()
+        cache = http_cache.HTTPCache(self.cache_dir.name, ttl=3600)
+        first, _ = self.fetch_calls(server, cache)
+        requests_before = len(server.request_log)
+        second, complete = self.fetch_calls(server, cache)
+        self.assertEqual(second, first)
+        self.assertTrue(complete)
+        self.assertEqual(len(server.request_log), requests_before)  # Nothing was asked from the server
+        self.assertEqual(cache.stats()["hits"], FIXTURE_PAGES)
+
+    def test_revalidation(self):
+        server = self.start_server()
+        cache = http_cache.HTTPCache(self.cache_dir.name, ttl=0)
+        first, _ = self.fetch_calls(server, cache)
+        answers_before = len(server.status_log)
+        second, _ = self.fetch_calls(server, cache)
+        self.assertEqual(second, first)
+        self.assertEqual(self.list_answers(server, answers_before), [304] * FIXTURE_PAGES)
+        self.assertEqual(cache.stats()["revalidated"], FIXTURE_PAGES)
+
+    def test_eviction(self):
+        server = self.start_server()
+        calls, _ = self.fetch_calls(server)
+        links = [call["Link"] for call in calls]
+        sizes = [len(vr_scraping.make_session().get(link).content) for link in links]
+        # Room for about three call pages
+        cache = http_cache.HTTPCache(self.cache_dir.name, ttl=3600, max_bytes=3 * max(sizes))
+        session = vr_scraping.make_session(cache=cache)
+        for link in links:
+            session.get(link)
+
+        self.assertGreater(cache.stats()["evicted"], 0)
+        self.assertLessEqual(cache.total_bytes, cache.max_bytes)
+        on_disk = sum(os.path.getsize(path) for path in cache.body_paths())
+        self.assertEqual(on_disk, cache.total_bytes)
+        # The pages used last are kept, the oldest ones were removed first
+        self.assertIsNotNone(cache.load(links[-1]))
+        self.assertIsNone(cache.load(links[0]))
+
+if __name__ == "__main__":
+    unittest.main()
+
+# Run the tests with: python -m unittest test_vr_scraping (or just python test_vr_scraping.py)
+# They start a local fake_vr_server.py, so no internet is needed.
@@ -1,44 +1,91 @@
+import argparse
+import glob
 import os
-import nltk
-import pandas as pd
-from nltk.tokenize import word_tokenize
-from nltk.corpus import stopwords, wordnet as wn
+import sys
+import time
+import numpy as np
 from collections import Counter
+from concurrent.futures import ProcessPoolExecutor, as_completed
+from functools import lru_cache
+from nltk_resources import MissingResourceError, NLTKResources
 
-# Download necessary NLTK data
-nltk.download('punkt')
-nltk.download('stopwords')
-nltk.download('wordnet')
+# NLTK and its data (tokenizer, stopwords, WordNet) are loaded the first time they are used.
+# Nothing is downloaded unless you run with --download-nltk.
+NLTK = NLTKResources()
+
+# The streaming path reads the text files this many characters at a time.
+STREAM_CHUNK_CHARS = 1024 * 1024
+# Text without any sentence end for this long is cut at a space anyway, so memory stays bounded.
+MAX_PENDING_CHARS = 8 * STREAM_CHUNK_CHARS
+
+# Which fallback get_theme uses when no theme word matches:
+# "wordnet" = pairwise WordNet similarity (slow), "centroid" = ThemeCentroidClassifier (fast)
+THEME_BACKEND = "wordnet"
+
+# Representative words for the similarity-based fallback.
+SIMILARITY_THEMES = {
+    "Engineering and Technology": ["technology", "engineering", "nuclear", "power", "energy", "electronics", "computing", "robotics", "nanotech"],
+    "Medical and Health Sciences": ["medicine", "health", "doctor", "biotech", "pharma", "disease", "biomolecule", "protein", "cure"],
+    "Natural Sciences": ["physics", "chemistry", "biology", "quantum", "material", "atoms", "molecules", "evolution", "astronomy"]
+}
+
+# Synsets of the theme words above, looked up once on first use.
+_theme_synsets = None
+
+def theme_synsets():
+    """
+    Returns {theme: [synsets of each representative word]}, leaving out words
+    WordNet doesn't know. The theme words never change, so this is only built once.
+    """
+    global _theme_synsets
+    if _theme_synsets is None:
+        wordnet = NLTK.wordnet()
+        _theme_synsets = {
+            theme: [synsets for synsets in (tuple(wordnet.synsets(rep)) for rep in rep_words) if synsets]
+            for theme, rep_words in SIMILARITY_THEMES.items()
+        }
+    return _theme_synsets
+
+@lru_cache(maxsize=20_000)
+def keyword_synsets(word):
+    """WordNet synsets of a keyword (memoized, keywords repeat a lot across documents)."""
+    return tuple(NLTK.wordnet().synsets(word))
+
+@lru_cache(maxsize=500_000)
+def pair_similarity(kw_syn, rep_syn):
+    """path_similarity of two synsets (memoized, the same pairs come up again and again)."""
+    return kw_syn.path_similarity(rep_syn)
+
+def similarity_cache_info():
+    """Hits, misses and hit rate of the WordNet caches, to check they help on big batches."""
+    info = {}
+    for name, cached in (("keyword_synsets", keyword_synsets), ("pair_similarity", pair_similarity)):
+        stats = cached.cache_info()
+        lookups = stats.hits + stats.misses
+        info[name] = {"hits": stats.hits, "misses": stats.misses, "size": stats.currsize,
+                      "hit_rate": stats.hits / lookups if lookups else 0.0}
+    return info
 
 def find_theme_by_similarity(keywords):
     """
     A more flexible similarity-based function. Instead of relying only on
     predefined keywords, we also take context into account for finding similarities.
     """
-    themes = {
-        "Engineering and Technology": ["technology", "engineering", "nuclear", "power", "energy", "electronics", "computing", "robotics", "nanotech"],
-        "Medical and Health Sciences": ["medicine", "health", "doctor", "biotech", "pharma", "disease", "biomolecule", "protein", "cure"],
-        "Natural Sciences": ["physics", "chemistry", "biology", "quantum", "material", "atoms", "molecules", "evolution", "astronomy"]
-    }
-    
     best_theme = None
     best_score = 0
     
     # Compute similarity between keyword sets and theme-specific words.
-    for theme, rep_words in themes.items():
+    for theme, rep_synset_lists in theme_synsets().items():
         total_similarity = 0
         count = 0
         for kw in keywords:
-            kw_synsets = wn.synsets(kw)
+            kw_synsets = keyword_synsets(kw)
             if not kw_synsets:
                 continue
-            for rep in rep_words:
-                rep_synsets = wn.synsets(rep)
-                if not rep_synsets:
-                    continue
+            for rep_synsets in rep_synset_lists:
                 for kw_syn in kw_synsets:
                     for rep_syn in rep_synsets:
-                        sim = kw_syn.path_similarity(rep_syn)
+                        sim = pair_similarity(kw_syn, rep_syn)
                         if sim is not None:
                             total_similarity += sim
                             count += 1
@@ -50,9 +97,117 @@ def find_theme_by_similarity(keywords):
                 
     return best_theme if best_theme is not None else "Uncategorized"
 
-def get_theme(keywords):
+def load_word_vectors(vectors_path):
+    """
+    Reads a word-vector text file (GloVe/word2vec text format: a word followed by its numbers on each line).
+    Returns ({word: row}, matrix).
+    """
+    index = {}
+    rows = []
+    with open(vectors_path, "r", encoding="utf-8") as f:
+        for line in f:
+            parts = line.rstrip().split(" ")
+            if len(parts) <= 2:  # word2vec header line ("count dimensions") or an empty line
+                continue
+            if parts[0] not in index:
+                index[parts[0]] = len(rows)
+                rows.append(np.asarray(parts[1:], dtype=np.float32))
+    return index, np.vstack(rows)
+
+class ThemeCentroidClassifier:
+    """
+    Classifies documents by comparing them with one precomputed vector per theme.
+    The theme vectors are the averages of their representative words, built once.
+    A document (its keywords) becomes one vector, and a single matrix product scores
+    it against all themes at once, instead of scanning synset pairs one by one.
+
+    Word vectors come from WordNet (a word's synsets and their hypernyms, where closer
+    ancestors weigh more), or from a local word-vector file if vectors_path is given.
+    """
+    def __init__(self, themes=SIMILARITY_THEMES, vectors_path=None):
+        self.theme_names = list(themes)
+        self.word_cache = {}
+
+        if vectors_path:
+            self.embedding_index, self.embeddings = load_word_vectors(vectors_path)
+            self.feature_index = None
+        else:
+            # The features are the synsets that occur in some theme word; other synsets
+            # can't add to any theme score, so they are left out
+            self.feature_index = {}
+            for rep_words in themes.values():
+                for rep in rep_words:
+                    for feature in self.wordnet_features(rep):
+                        self.feature_index.setdefault(feature, len(self.feature_index))
+
+        centroids = []
+        for rep_words in themes.values():
+            vectors = [self.word_vector(rep) for rep in rep_words]
+            centroids.append(self.normalize(np.mean(vectors, axis=0)))
+        self.centroids = np.vstack(centroids)  # One row per theme
+
+    @staticmethod
+    def normalize(vector):
+        norm = np.linalg.norm(vector)
+        return vector / norm if norm > 0 else vector
+
+    @staticmethod
+    def wordnet_features(word):
+        """{synset name: weight} for the synsets of a word and all their hypernyms."""
+        features = {}
+        for synset in NLTK.wordnet().synsets(word):
+            for ancestor, distance in synset.hypernym_distances():
+                weight = 1.0 / (1 + distance)
+                if weight > features.get(ancestor.name(), 0):
+                    features[ancestor.name()] = weight
+        return features
+
+    def word_vector(self, word):
+        """Normalized vector of one word (zeros if the word is unknown), cached per word."""
+        word = word.lower()
+        if word not in self.word_cache:
+            if self.feature_index is None:
+                row = self.embedding_index.get(word)
+                vector = self.embeddings[row] if row is not None else np.zeros(self.embeddings.shape[1], dtype=np.float32)
+            else:
+                vector = np.zeros(len(self.feature_index), dtype=np.float32)
+                for feature, weight in self.wordnet_features(word).items():
+                    column = self.feature_index.get(feature)
+                    if column is not None:
+                        vector[column] = weight
+            self.word_cache[word] = self.normalize(vector)
+        return self.word_cache[word]
+
+    def document_vector(self, keywords):
+        if not keywords:
+            return np.zeros(self.centroids.shape[1], dtype=np.float32)
+        return np.sum([self.word_vector(kw) for kw in keywords], axis=0)
+
+    def classify_many(self, keyword_lists):
+        """Returns the theme of every document (a list of keywords each) with one matrix product."""
+        if not keyword_lists:
+            return []
+        documents = np.vstack([self.document_vector(keywords) for keywords in keyword_lists])
+        scores = documents @ self.centroids.T  # Documents x themes
+        best = scores.argmax(axis=1)
+        return [self.theme_names[b] if scores[i, b] > 0 else "Uncategorized" for i, b in enumerate(best)]
+
+    def classify(self, keywords):
+        return self.classify_many([keywords])[0]
+
+# Built on first use, building it looks up all the theme words in WordNet.
+_centroid_classifier = None
+
+def get_centroid_classifier():
+    global _centroid_classifier
+    if _centroid_classifier is None:
+        _centroid_classifier = ThemeCentroidClassifier()
+    return _centroid_classifier
+
+def get_theme(keywords, backend=None):
     """
     Refined theme classification considering keyword matching and the broader context.
+    backend picks the fallback when no theme word matches ("wordnet" or "centroid", default THEME_BACKEND).
     """
     keywords_lower = [k.lower() for k in keywords]
     
@@ -83,25 +238,135 @@ def get_theme(keywords):
     best_theme = max(scores, key=scores.get)
     
     if scores[best_theme] == 0:
+        if (backend or THEME_BACKEND) == "centroid":
+            return get_centroid_classifier().classify(keywords)
         return find_theme_by_similarity(keywords)
 
     return best_theme
 
-def process_text(text, title):
+def process_text(text, title, backend=None):
     """
     Process the text: tokenize, remove stopwords, count word frequencies,
     extract the top 5 keywords, determine the theme, and build DCAT-like metadata.
     """
-    tokens = word_tokenize(text)
-    stop_words = set(stopwords.words('english'))
+    tokens = NLTK.word_tokenize(text)
+    stop_words = set(NLTK.stopwords('english'))
     filtered_tokens = [token for token in tokens if token.lower() not in stop_words and token.isalpha()]
     
-    # Count word frequencies and pick top 5 keywords.
+    # Count word frequencies.
     freq = Counter(filtered_tokens)
+    return build_metadata(freq, title, backend)
+
+def stream_tokens(chunks):
+    """
+    Tokenizes text that arrives in pieces (chunks of a big file) and gives the same
+    tokens as word_tokenize on the whole text: word_tokenize splits the text into
+    sentences and then each sentence into words, so here only the complete sentences
+    are tokenized and the last, maybe unfinished, sentence waits for the next chunk.
+    """
+    sentence_tokenizer = NLTK.sentence_tokenizer()
+    word_tokenizer = NLTK.word_tokenizer()
+    pending = ""
+    for chunk in chunks:
+        pending += chunk
+        # A word at the very end may continue in the next chunk, keep it out of this round
+        end = len(pending)
+        while end and not pending[end - 1].isspace():
+            end -= 1
+        complete, rest = pending[:end], pending[end:]
+
+        spans = list(sentence_tokenizer.span_tokenize(complete))
+        if len(spans) > 1:
+            for start, stop in spans[:-1]:
+                yield from word_tokenizer.tokenize(complete[start:stop])
+            pending = complete[spans[-1][0]:] + rest
+        elif len(pending) > MAX_PENDING_CHARS and complete:
+            # No sentence end in sight: tokenize what we have (only here the result may differ slightly)
+            yield from word_tokenizer.tokenize(complete)
+            pending = rest
+
+    for start, stop in sentence_tokenizer.span_tokenize(pending):
+        yield from word_tokenizer.tokenize(pending[start:stop])
+
+class TextPipeline:
+    """
+    process_text for many documents: the stopword set is built once, and the token
+    filter remembers its answer for every word it has seen, so across thousands of
+    documents each distinct word is lowercased and checked only once. After that a
+    token is kept or dropped with a single set lookup.
+    The results are the same as process_text.
+    """
+    def __init__(self, language='english', backend=None, max_cached_tokens=500_000):
+        self.language = language
+        self.backend = backend
+        self.stop_words = frozenset(NLTK.stopwords(language))
+        self.accepted = set()  # Tokens that are keyword candidates
+        self.rejected = set()  # Stopwords, numbers, punctuation...
+        self.max_cached_tokens = max_cached_tokens
+
+    def learn(self, tokens):
+        """Decides once for every token not seen before whether it is a keyword candidate."""
+        new_tokens = set(tokens) - self.accepted
+        new_tokens -= self.rejected
+        if len(self.accepted) + len(self.rejected) + len(new_tokens) > self.max_cached_tokens:
+            # Rare, only for huge vocabularies: start over so memory stays bounded
+            self.accepted.clear()
+            self.rejected.clear()
+            new_tokens = set(tokens)
+        for token in new_tokens:
+            if token.isalpha() and token.lower() not in self.stop_words:
+                self.accepted.add(token)
+            else:
+                self.rejected.add(token)
+
+    def count(self, tokens):
+        """
+        Word counts of the keyword candidates, in the order they first appear
+        (so ties in most_common come out as in process_text).
+        """
+        if isinstance(tokens, list):
+            self.learn(tokens)
+            accepted = self.accepted
+            return Counter([token for token in tokens if token in accepted])
+
+        # A stream of tokens (process_file): count everything, then filter the distinct words
+        freq = Counter(tokens)
+        self.learn(freq)
+        accepted = self.accepted
+        return Counter({token: count for token, count in freq.items() if token in accepted})
+
+    def process_text(self, text, title, backend=None):
+        return build_metadata(self.count(NLTK.word_tokenize(text)), title, backend or self.backend)
+
+    def process_file(self, filename, title=None, backend=None, chunk_chars=STREAM_CHUNK_CHARS):
+        """
+        Same result as process_text(f.read(), title) but the file is read and tokenized
+        in chunks, so memory depends on the vocabulary and not on the size of the file.
+        """
+        with open(filename, "r", encoding="utf-8") as f:
+            chunks = iter(lambda: f.read(chunk_chars), "")
+            freq = self.count(stream_tokens(chunks))
+        return build_metadata(freq, filename if title is None else title, backend or self.backend)
+
+# The pipeline process_file_streaming uses, made on first use.
+_pipeline = None
+
+def get_pipeline():
+    global _pipeline
+    if _pipeline is None:
+        _pipeline = TextPipeline()
+    return _pipeline
+
+def process_file_streaming(filename, title=None, backend=None, chunk_chars=STREAM_CHUNK_CHARS):
+    """Reads, tokenizes and counts a file in chunks with the shared TextPipeline."""
+    return get_pipeline().process_file(filename, title, backend, chunk_chars)
+
+def build_metadata(freq, title, backend=None):
+    """Picks the top 5 keywords from the word counts, finds the theme and builds the metadata."""
     common_keywords = [word for word, count in freq.most_common(5)]
     
     # Get the theme based on the refined keyword matching and contextual analysis.
-    theme = get_theme(common_keywords)
+    theme = get_theme(common_keywords, backend)
     
     # Build a description from the keywords.
     description = f"This project involves {', '.join(common_keywords)}."
@@ -117,6 +382,150 @@ def process_text(text, title):
     
     return metadata
 
+METADATA_COLUMNS = ["Dataset", "Title", "Description", "Theme", "Keyword"]
+
+def save_metadata(metadata_list, output_file=None):
+    """
+    Saves the metadata rows to an Excel file (or a CSV file if output_file ends with .csv).
+    Without output_file it picks exceltest.xlsx, or exceltest1.xlsx, exceltest2.xlsx... if that exists.
+    """
+    import pandas as pd  # Only needed here, and slow to import
+
+    # Create a DataFrame from the metadata list.
+    df = pd.DataFrame(metadata_list, columns=METADATA_COLUMNS)
+    
+    if output_file is None:
+        # Determine an output filename: if exceltest.xlsx exists, increment a counter. eaxmpel: exceltest2.xlsx
+        base_filename = "exceltest"
+        extension = ".xlsx"
+        output_file = base_filename + extension
+        counter = 1
+        while os.path.exists(output_file):
+            output_file = f"{base_filename}{counter}{extension}"
+            counter += 1
+
+    # Save the metadata to the Excel (or CSV) file.
+    if output_file.lower().endswith(".csv"):
+        df.to_csv(output_file, index=False)
+    else:
+        df.to_excel(output_file, index=False)
+    return output_file
+
+def init_worker(backend, offline):
+    """
+    Runs once in every worker process of the batch mode: loads the NLTK resources
+    (tokenizer, stopwords, WordNet) up front, so each file doesn't pay for it.
+    """
+    global THEME_BACKEND
+    THEME_BACKEND = backend
+    NLTK.offline = offline  # Workers never download, the main process already checked everything
+    NLTK.word_tokenize("Warm up.")
+    get_pipeline()  # Reads the stopwords
+    NLTK.wordnet().ensure_loaded()
+    if backend == "centroid":
+        get_centroid_classifier()
+
+def process_file(filename):
+    """Reads a text file and returns its metadata (used by the batch workers)."""
+    return process_file_streaming(filename)
+
+def find_text_files(sources):
+    """Expands directories (all .txt files in them) and glob patterns to a sorted list of files."""
+    files = []
+    for source in sources:
+        if os.path.isdir(source):
+            # README.txt explains the folder, it is not a project text
+            files.extend(path for path in glob.glob(os.path.join(source, "*.txt"))
+                         if os.path.basename(path).lower() != "readme.txt")
+        else:
+            files.extend(path for path in glob.glob(source) if os.path.isfile(path))
+    return sorted(set(files))
+
+def run_batch(sources, workers=None, output_file=None, backend=None):
+    """
+    Non-interactive mode: processes all text files from directories/globs in a process pool.
+    Rows are printed as soon as each file is done, the output file is written once at the end.
+    """
+    files = find_text_files(sources)
+    if not files:
+        print("No text files found. Exiting.")
+        return None
+
+    # Fail (or download) before any worker starts, not once per file
+    NLTK.ensure_all()
+
+    results = {}
+    with ProcessPoolExecutor(max_workers=workers, initializer=init_worker,
+                             initargs=(backend or THEME_BACKEND, NLTK.offline)) as pool:
+        futures = {pool.submit(process_file, filename): filename for filename in files}
+        for future in as_completed(futures):
+            filename = futures[future]
+            try:
+                metadata = future.result()
+            except Exception as e:
+                print(f"Failed to process {filename}: {e}")
+                continue
+            results[filename] = metadata
+            print(f"{metadata['Title']}\t{metadata['Theme']}\t{metadata['Keyword']}")
+
+    if not results:
+        print("No files processed. Exiting.")
+        return None
+
+    # Same order as the input files, whatever order the workers finished in
+    metadata_list = [results[filename] for filename in files if filename in results]
+    output_file = save_metadata(metadata_list, output_file)
+    print(f"Metadata for {len(metadata_list)} project(s) saved to {output_file}")
+    return output_file
+
+def benchmark_pipeline(sources, repeat=20):
+    """
+    Per-document cost of process_text against a reused TextPipeline, on the same texts.
+    "Filter + count" times only the part the pipeline changes (on already tokenized texts),
+    "Whole document" includes tokenizing and finding the theme.
+    """
+    files = find_text_files(sources)
+    if not files:
+        print("No text files found.")
+        return
+    documents = []
+    for filename in files:
+        with open(filename, "r", encoding="utf-8") as f:
+            documents.append((f.read(), filename))
+    token_lists = [NLTK.word_tokenize(text) for text, title in documents]
+
+    # Warm up: load the NLTK data and fill the WordNet caches, so only the per-document work is timed
+    old_results = [process_text(text, title) for text, title in documents]
+    pipeline = TextPipeline()
+    new_results = [pipeline.process_text(text, title) for text, title in documents]
+
+    def per_document(func):
+        best = None
+        for _ in range(repeat):
+            start = time.perf_counter()
+            for item in func():
+                pass
+            elapsed = (time.perf_counter() - start) / len(documents)
+            best = elapsed if best is None else min(best, elapsed)
+        return best * 1e6  # Microseconds
+
+    def old_count():
+        for tokens in token_lists:
+            stop_words = set(NLTK.stopwords('english'))
+            yield Counter([token for token in tokens if token.lower() not in stop_words and token.isalpha()])
+
+    timings = [
+        ("Filter + count", per_document(old_count),
+         per_document(lambda: (pipeline.count(tokens) for tokens in token_lists))),
+        ("Whole document", per_document(lambda: (process_text(text, title) for text, title in documents)),
+         per_document(lambda: (pipeline.process_text(text, title) for text, title in documents))),
+    ]
+
+    print(f"Documents: {len(documents)}, {sum(map(len, token_lists))} tokens")
+    for name, old_time, new_time in timings:
+        print(f"{name}:  process_text {old_time:.1f} us/doc  TextPipeline {new_time:.1f} us/doc  ({old_time / new_time:.1f}x)")
+    print("Results match" if old_results == new_results else "WARNING: results differ!")
+
 def main():
     # Ask the user for the number of text files to process.
     num_files = int(input("Enter the number of text files to process: "))
@@ -129,38 +538,59 @@ def main():
             print(f"File {filename} not found. Skipping this file.")
             continue
         
-        with open(filename, "r", encoding="utf-8") as f:
-            text = f.read()
-        
-        metadata = process_text(text, filename)
+        # Read and tokenized in chunks, so very large files work too
+        metadata = process_file_streaming(filename)
         metadata_list.append(metadata)
     
     if not metadata_list:
         print("No files processed. Exiting.")
         return
     
-    # Create a DataFrame from the metadata list.
-    df = pd.DataFrame(metadata_list, columns=["Dataset", "Title", "Description", "Theme", "Keyword"])
-    
-    # Determine an output filename: if exceltest.xlsx exists, increment a counter. eaxmpel: exceltest2.xlsx
-    base_filename = "exceltest"
-    extension = ".xlsx"
-    output_excel = base_filename + extension
-    counter = 1
-    while os.path.exists(output_excel):
-        output_excel = f"{base_filename}{counter}{extension}"
-        counter += 1
-
-    # Save the metadata to the Excel file.
-    df.to_excel(output_excel, index=False)
+    output_excel = save_metadata(metadata_list)
     
     print(f"Metadata for {len(metadata_list)} project(s) saved to {output_excel}")
 
+def parse_args():
+    parser = argparse.ArgumentParser(description="Extract keywords, theme and DCAT-like metadata from text files.")
+    parser.add_argument("--batch", nargs="+", metavar="DIR_OR_GLOB",
+                        help="process all .txt files in these directories / matching these globs without asking")
+    parser.add_argument("--workers", type=int, default=None, help="number of worker processes (default: one per CPU)")
+    parser.add_argument("--output", default=None, help="output file, .xlsx or .csv (default: exceltest.xlsx)")
+    parser.add_argument("--backend", choices=["wordnet", "centroid"], default=None,
+                        help="theme fallback to use (default: THEME_BACKEND)")
+    parser.add_argument("--benchmark", nargs="*", metavar="DIR_OR_GLOB",
+                        help="time process_text against TextPipeline (default: the txt_filer folder)")
+    group = parser.add_mutually_exclusive_group()
+    group.add_argument("--offline", action="store_true",
+                       help="never download, stop right away if NLTK data is missing")
+    group.add_argument("--download-nltk", action="store_true",
+                       help="download the NLTK data that is missing")
+    return parser.parse_args()
+
 if __name__ == "__main__":
-    main()
+    args = parse_args()
+    NLTK.offline = args.offline
+    NLTK.allow_download = args.download_nltk
+    try:
+        if args.offline or args.download_nltk:
+            NLTK.ensure_all()
+        if args.benchmark is not None:
+            benchmark_pipeline(args.benchmark or [os.path.join(os.path.dirname(os.path.abspath(__file__)), "txt_filer")])
+        elif args.batch:
+            run_batch(args.batch, workers=args.workers, output_file=args.output, backend=args.backend)
+        elif not args.download_nltk:
+            main()
+    except MissingResourceError as e:
+        sys.exit(str(e))
 
 
 
 # in the terminal it will ask how many txt file you wanna read in. type a number.
 # then it will ask each txt file you wanna read in.
-# exampel test2.txt, then press enter then it will ask for next txt file to type in.
\ No newline at end of file
+# exampel test2.txt, then press enter then it will ask for next txt file to type in.
+# to do a whole folder at once without typing every name: python texttester.py --batch txt_filer
+# (or a pattern like "txt_filer/test*.txt", add --output result.csv for a CSV file instead of Excel)
+# the first time, get the NLTK data with: python texttester.py --download-nltk
+# on a computer without internet use --offline, then it stops right away if the NLTK data is missing.
+# to compare the speed of process_text and the reusable TextPipeline: python texttester.py --benchmark
+# for many files, set THEME_BACKEND = "centroid" at the top, it is much faster than the WordNet comparison.
\ No newline at end of file
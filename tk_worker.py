@@ -0,0 +1,85 @@
+import queue
+import threading
+
+class TaskCancelled(Exception):
+    """Raised inside a background task when it has been cancelled."""
+
+class BackgroundTask:
+    """
+    Runs a function in a worker thread and hands progress and results back to
+    the Tk main loop with root.after, so no Tk calls ever happen off the main thread.
+
+    The function is called as func(task, *args), where task is this object.
+    Inside it, call task.report_progress(value) and task.check_cancelled() between steps.
+    All callbacks (on_progress, on_done, on_error, on_cancel) run on the Tk thread.
+    """
+    def __init__(self, root, func, *args, on_done=None, on_error=None, on_progress=None,
+                 on_cancel=None, poll_interval=50):
+        self.root = root
+        self.func = func
+        self.args = args
+        self.on_done = on_done
+        self.on_error = on_error
+        self.on_progress = on_progress
+        self.on_cancel = on_cancel
+        self.poll_interval = poll_interval
+
+        self.messages = queue.Queue()  # Worker -> Tk thread
+        self.cancel_event = threading.Event()
+        self.finished = False
+
+    def start(self):
+        threading.Thread(target=self._run, daemon=True).start()
+        self.root.after(self.poll_interval, self._poll)
+        return self
+
+    def cancel(self):
+        """Ask the task to stop. Any result it still produces is thrown away."""
+        self.cancel_event.set()
+
+    @property
+    def cancelled(self):
+        return self.cancel_event.is_set()
+
+    def check_cancelled(self):
+        """Call from the worker between steps to stop early when cancelled."""
+        if self.cancel_event.is_set():
+            raise TaskCancelled()
+
+    def report_progress(self, value):
+        """Call from the worker to send a progress value to on_progress."""
+        self.messages.put(("progress", value))
+
+    def _run(self):
+        try:
+            result = self.func(self, *self.args)
+            self.messages.put(("done", result))
+        except TaskCancelled:
+            self.messages.put(("cancelled", None))
+        except Exception as e:
+            self.messages.put(("error", e))
+
+    def _poll(self):
+        # Runs on the Tk thread: handle everything the worker has sent so far
+        try:
+            while True:
+                kind, value = self.messages.get_nowait()
+                if kind == "progress":
+                    if self.on_progress and not self.cancelled:
+                        self.on_progress(value)
+                    continue
+
+                self.finished = True
+                if kind == "done" and not self.cancelled:
+                    if self.on_done:
+                        self.on_done(value)
+                elif kind == "error" and not self.cancelled:
+                    if self.on_error:
+                        self.on_error(value)
+                elif self.on_cancel:
+                    self.on_cancel()
+                return
+        except queue.Empty:
+            pass
+
+        self.root.after(self.poll_interval, self._poll)
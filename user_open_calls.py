@@ -7,17 +7,49 @@ from selenium.webdriver.chrome.service import Service
 from selenium.webdriver.chrome.options import Options
 from selenium.webdriver.common.by import By
 from selenium.common.exceptions import InvalidSessionIdException
-from bs4 import BeautifulSoup
 from webdriver_manager.chrome import ChromeDriverManager
-import requests
-import re
 import threading
+import json
+import call_store
+import http_cache
+import vr_scraping
+from tk_worker import BackgroundTask
 
 # Global Variables
 driver = None
 project_details = []
 TARGET_URL = "https://www.vr.se/english/applying-for-funding/calls-and-decisions.html?filters=callsOpen;&selectedSubject=all"
-monitor_running = True  # Flag to control the monitor thread
+monitor_stop = threading.Event()  # Set to stop the monitor thread, wakes it up right away
+monitor_thread = None
+# The URL check starts every 0.2 s and slows down to every 2 s while nobody navigates away.
+# After a blocked navigation it is back to 0.2 s, since someone is clicking around.
+MONITOR_MIN_INTERVAL = 0.2
+MONITOR_MAX_INTERVAL = 2.0
+MONITOR_BACKOFF = 1.5
+MONITOR_JOIN_TIMEOUT = 5  # Seconds quit waits for the monitor thread
+
+# Runs in every page the browser opens: clicks on links that lead away from the target page
+# are stopped in the browser itself, so most navigations never happen and need no polling.
+# (Only the navigation is stopped, buttons like "Show more" still run their own script.)
+NAVIGATION_GUARD_JS = """
+document.addEventListener('click', function (event) {
+    var link = event.target.closest && event.target.closest('a[href]');
+    if (!link) return;
+    var url = new URL(link.href, location.href);
+    if (url.protocol !== 'http:' && url.protocol !== 'https:') return;
+    url.hash = '';
+    var here = new URL(location.href);
+    here.hash = '';
+    if (url.href !== here.href && url.href !== %s) {
+        event.preventDefault();
+    }
+}, true);
+""" % json.dumps(TARGET_URL)
+themes_task = None  # The background fetching of the call pages for "Open Diagram"
+MAX_CONCURRENT_REQUESTS = 8  # How many call pages are fetched at the same time
+page_cache = http_cache.HTTPCache()  # Call pages from earlier runs, only downloaded again if they changed
+store = call_store.CallStore()  # The calls (and their subject areas) from earlier runs
+call_diff = None  # What changed since the last run: new, changed and closed calls
 
 def open_browser():
     global driver
@@ -35,6 +67,12 @@ def open_browser():
 
     # Start Chrome in locked mode
     driver = webdriver.Chrome(service=Service(ChromeDriverManager().install()), options=chrome_options)
+
+    # Block links to other pages inside the browser (Chrome DevTools command, before the page opens)
+    try:
+        driver.execute_cdp_cmd("Page.addScriptToEvaluateOnNewDocument", {"source": NAVIGATION_GUARD_JS})
+    except Exception:
+        pass  # Not Chrome, the monitor thread still resets the URL
     
     # Open the target URL
     driver.get(TARGET_URL)
@@ -43,55 +81,53 @@ def open_browser():
     root.attributes('-topmost', 1)
     
     # Start monitoring the URL in a separate daemon thread
-    threading.Thread(target=monitor_url, daemon=True).start()
-
-def monitor_url():
-    global driver, monitor_running
+    start_monitoring()
 
-    while monitor_running:
-        time.sleep(0.2)  # Check frequently for instant reaction
+def start_monitoring():
+    global monitor_stop, monitor_thread
+    stop_monitoring()
+    monitor_stop = threading.Event()
+    monitor_thread = threading.Thread(target=monitor_url, args=(monitor_stop,), daemon=True)
+    monitor_thread.start()
+
+def monitor_url(stop_event):
+    # Backstop for navigations the click guard can't stop (typed URLs, scripts, redirects)
+    interval = MONITOR_MIN_INTERVAL
+    # wait() returns True as soon as stop_monitoring is called, however long the interval is
+    while not stop_event.wait(interval):
         try:
             # Only proceed if driver is still valid
             if driver and driver.session_id:
                 current_url = driver.current_url
                 if current_url != TARGET_URL:
-                    driver.get(TARGET_URL)  # Instantly reset the URL
-                    time.sleep(0.1)  # Give it a tiny pause to reload
+                    driver.get(TARGET_URL)  # Reset the URL
+                    interval = MONITOR_MIN_INTERVAL
+                else:
+                    interval = min(interval * MONITOR_BACKOFF, MONITOR_MAX_INTERVAL)
         except (InvalidSessionIdException, Exception) as e:
             # If the driver session is invalid or we get a connection error, stop the monitoring thread
             # (Suppress the error messages during shutdown.)
             break
 
 def extract_open_calls():
-    global project_details
+    global project_details, call_diff
 
     if not driver:
         print("Error: Selenium driver is not running.")
         return
 
+    # Stop the monitor thread first, so it can't reload the page while we read it
+    stop_monitoring()
+
     # Instead of a fixed sleep, we could wait briefly, but here we'll use a short sleep
     time.sleep(1)  # Allow the page to settle
 
-    # Extract the page source
-    soup = BeautifulSoup(driver.page_source, 'html.parser')
-
-    # Find all valid project links
-    links = soup.find_all("a", href=True)
-    call_links = [link for link in links if link["href"].startswith("/english/applying-for-funding/calls/")]
-
-    # Extract project details
-    project_details = []
-    for link in call_links:
-        full_url = f"https://www.vr.se{link['href']}"
-        title = link.get_text(strip=True)
-        date_text = (link.find_parent("div")
-                     .find("p", class_="content__list__text__date").text.strip()
-                     if link.find_parent("div") else "No date")
-        project_details.append({
-            "Title": title,
-            "Link": full_url,
-            "Date": date_text
-        })
+    # Extract the project links and dates from the page source
+    project_details = vr_scraping.parse_call_links(driver.page_source)
+
+    # Compare with the last run and remember the calls for next time (the page may not show
+    # the whole list, so calls missing from it are not marked as closed)
+    call_diff = store.update(project_details)
 
     # Close the Selenium browser
     try:
@@ -99,41 +135,84 @@ def extract_open_calls():
     except Exception:
         pass
 
-    # Stop the monitor thread
-    stop_monitoring()
-
     # Show results
     show_results_window()
 
 def extract_themes():
+    global themes_task
+    if themes_task and not themes_task.finished:
+        return  # Still fetching from the last click
+
+    urls = [project['Link'] for project in project_details]
+    theme_label, theme_text = show_themes_window()
     themes = []
-    for project in project_details:
-        url = project['Link']
-        response = requests.get(url)
-        soup = BeautifulSoup(response.content, 'html.parser')
-        text_content = soup.get_text()
-        match = re.search(r'Subject area:\s*(.*?)\s*Support form:', text_content)
-        if match:
-            subject_area = match.group(1).strip()
-            themes.append(subject_area)
-    show_themes_window(themes)
-
-def show_themes_window(themes):
+    failed = []
+
+    def add_theme(subject_area):
+        themes.append(subject_area)
+        theme_text.config(state=tk.NORMAL)
+        theme_text.insert(tk.END, f"Theme: {subject_area}\n")
+        theme_text.insert(tk.END, "-" * 50 + "\n")
+        theme_text.config(state=tk.DISABLED)
+
+    # Calls that haven't changed since an earlier run already have their subject area in the store
+    known = store.subject_areas(urls)
+    for url in urls:
+        if known.get(url):
+            add_theme(known[url])
+    to_fetch = [url for url in urls if url not in known]
+    checked = len(urls) - len(to_fetch)
+
+    def on_progress(result):
+        # Runs on the Tk thread, once for every call page as soon as it has been fetched
+        nonlocal checked
+        checked += 1
+        url, subject_area, error = result
+        if error is not None:
+            failed.append(url)
+            return
+        store.set_subject_area(url, subject_area)
+        if subject_area:
+            add_theme(subject_area)
+        theme_label.config(text=f"Found {len(themes)} Project Themes (checked {checked} of {len(urls)} calls...)")
+
+    def on_done(result):
+        text = f"Found {len(themes)} Project Themes"
+        if len(to_fetch) < len(urls):
+            text += f" ({len(urls) - len(to_fetch)} known from earlier runs)"
+        if failed:
+            text += f" ({len(failed)} pages could not be loaded)"
+        theme_label.config(text=text)
+        print(page_cache.stats_text())
+
+    def on_error(error):
+        theme_label.config(text=f"Found {len(themes)} Project Themes (stopped: {error})")
+
+    # The pages are fetched in a worker thread, so the window keeps responding
+    themes_task = BackgroundTask(root, fetch_themes, to_fetch, on_progress=on_progress,
+                                 on_done=on_done, on_error=on_error).start()
+
+def fetch_themes(task, urls):
+    # Runs in the worker thread: several pages at once, each result is sent to the window right away
+    session = vr_scraping.make_session(pool_size=MAX_CONCURRENT_REQUESTS, cache=page_cache)
+    for result in vr_scraping.fetch_subject_areas(urls, session, max_workers=MAX_CONCURRENT_REQUESTS):
+        task.check_cancelled()
+        task.report_progress(result)
+
+def show_themes_window():
     theme_window = tk.Toplevel(root)
     theme_window.title("Project Themes")
     theme_window.geometry("600x400")
     theme_window.attributes('-topmost', 1)
     theme_window.protocol("WM_DELETE_WINDOW", quit_application)
 
-    theme_label = tk.Label(theme_window, text=f"Found {len(themes)} Project Themes", font=("Arial", 14, "bold"))
+    theme_label = tk.Label(theme_window, text="Loading Project Themes...", font=("Arial", 14, "bold"))
     theme_label.pack(pady=10)
 
     theme_text = scrolledtext.ScrolledText(theme_window, width=70, height=15)
     theme_text.pack(padx=10, pady=10)
-    for theme in themes:
-        theme_text.insert(tk.END, f"Theme: {theme}\n")
-        theme_text.insert(tk.END, "-" * 50 + "\n")
     theme_text.config(state=tk.DISABLED)
+    return theme_label, theme_text
 
 def show_results_window():
     root.withdraw()  # Hide the main window
@@ -146,10 +225,19 @@ def show_results_window():
     count_label = tk.Label(result_window, text=f"Found {len(project_details)} Open Calls", font=("Arial", 14, "bold"))
     count_label.pack(pady=10)
 
+    if call_diff is not None:
+        changes_label = tk.Label(result_window, font=("Arial", 11),
+                                 text=f"Since last time: {len(call_diff.new)} new, {len(call_diff.changed)} changed, "
+                                      f"{len(call_diff.closed)} closed")
+        changes_label.pack()
+
     result_text = scrolledtext.ScrolledText(result_window, width=70, height=15)
     result_text.pack(padx=10, pady=10)
+    new_links = {call['Link'] for call in call_diff.new} if call_diff else set()
+    changed_links = {call['Link'] for call in call_diff.changed} if call_diff else set()
     for project in project_details:
-        result_text.insert(tk.END, f"Title: {project['Title']}\n")
+        status = " [NEW]" if project['Link'] in new_links else " [CHANGED]" if project['Link'] in changed_links else ""
+        result_text.insert(tk.END, f"Title: {project['Title']}{status}\n")
         result_text.insert(tk.END, f"Link: {project['Link']}\n")
         result_text.insert(tk.END, f"Date: {project['Date']}\n")
         result_text.insert(tk.END, "-" * 50 + "\n")
@@ -162,12 +250,16 @@ def show_results_window():
     quit_button.pack(pady=10)
 
 def stop_monitoring():
-    global monitor_running
-    monitor_running = False
+    # Wake the monitor thread up and wait until it has really stopped
+    monitor_stop.set()
+    if monitor_thread and monitor_thread is not threading.current_thread():
+        monitor_thread.join(timeout=MONITOR_JOIN_TIMEOUT)
 
 def quit_application():
     # Stop monitoring and close the Selenium driver if it's still open
     stop_monitoring()
+    if themes_task:
+        themes_task.cancel()  # Stops fetching call pages
     try:
         if driver:
             driver.quit()
@@ -196,4 +288,8 @@ root.mainloop()
 
 # TO complicated to explain how it works
 # If you manage to make this code work on your PC, 
+# the calls are saved in open_calls.sqlite, so next time it shows which calls are new, changed or closed since then,
+# and "Open Diagram" only has to load the pages of the new and changed calls.
+# "Open Diagram" loads the call pages 8 at a time in the background, the themes show up in the window as they come in.
+# (change MAX_CONCURRENT_REQUESTS at the top to load more or fewer at the same time)
 # It is worth noting when shutting the program down by either pressing quit or the X button the small pop-up windows take a little short while to make it close all windows down and end the process.
@@ -0,0 +1,127 @@
+import numpy as np
+import pandas as pd
+import tkinter as tk
+from tkinter import ttk
+
+class VirtualTable(tk.Frame):
+    """
+    A table that only creates rows for the part of the data that is visible.
+    The rows are read from the DataFrame through a view order (row positions),
+    so loading, sorting or filtering costs the same no matter how many rows there are.
+    """
+    def __init__(self, master, max_cell_chars=200, column_width=150, **kwargs):
+        super().__init__(master, **kwargs)
+        self.data = None
+        self.order = np.arange(0)  # Row positions in the order they are shown
+        self.first_row = 0  # Index in self.order of the top visible row
+        self.visible_rows = 30
+        self.max_cell_chars = max_cell_chars  # Long texts (abstracts) are cut in the table
+        self.column_width = column_width
+        self.on_heading_click = None  # Called with the column name when a heading is clicked
+
+        self.tree = ttk.Treeview(self, show='headings', selectmode='browse')
+        self.vscroll = ttk.Scrollbar(self, orient=tk.VERTICAL, command=self.on_scrollbar)
+        self.hscroll = ttk.Scrollbar(self, orient=tk.HORIZONTAL, command=self.tree.xview)
+        self.tree.configure(xscrollcommand=self.hscroll.set)
+
+        self.tree.grid(row=0, column=0, sticky='nsew')
+        self.vscroll.grid(row=0, column=1, sticky='ns')
+        self.hscroll.grid(row=1, column=0, sticky='ew')
+        self.rowconfigure(0, weight=1)
+        self.columnconfigure(0, weight=1)
+
+        # Scrolling only moves the window over the data, the Treeview never holds more rows
+        self.tree.bind('<MouseWheel>', self.on_mousewheel)
+        self.tree.bind('<Button-4>', lambda event: self.scroll_rows(-3))  # Linux scroll up
+        self.tree.bind('<Button-5>', lambda event: self.scroll_rows(3))  # Linux scroll down
+        self.tree.bind('<Prior>', lambda event: self.scroll_rows(-self.visible_rows))
+        self.tree.bind('<Next>', lambda event: self.scroll_rows(self.visible_rows))
+        self.tree.bind('<Home>', lambda event: self.scroll_to(0))
+        self.tree.bind('<End>', lambda event: self.scroll_to(len(self.order)))
+        self.tree.bind('<Configure>', self.on_resize)
+
+    def set_data(self, data, order=None):
+        """Shows a new DataFrame. Only the visible rows are turned into table rows."""
+        self.data = data
+        columns = [f"c{i}" for i in range(len(data.columns))]
+        self.tree.configure(columns=columns)
+        for column_id, name in zip(columns, data.columns):
+            self.tree.heading(column_id, text=str(name), command=lambda name=name: self.heading_clicked(name))
+            self.tree.column(column_id, width=self.column_width, stretch=False)
+        self.set_order(np.arange(len(data)) if order is None else order)
+
+    def set_order(self, order):
+        """Changes which rows are shown and in what order (an array of row positions)."""
+        self.order = np.asarray(order)
+        self.first_row = 0
+        self.render()
+
+    def heading_clicked(self, name):
+        if self.on_heading_click:
+            self.on_heading_click(name)
+
+    def format_value(self, value):
+        if value is None or (not isinstance(value, str) and pd.isna(value)):
+            return ""
+        text = str(value).replace("\n", " ")
+        if len(text) > self.max_cell_chars:
+            text = text[:self.max_cell_chars] + "..."
+        return text
+
+    def render(self):
+        """Fills the Treeview with the rows from first_row that fit in the window."""
+        self.tree.delete(*self.tree.get_children())
+        if self.data is None:
+            return
+
+        positions = self.order[self.first_row:self.first_row + self.visible_rows]
+        window = self.data.iloc[positions]
+        for position, row in zip(positions, window.itertuples(index=False, name=None)):
+            # The item id is the row position, so clicks map straight back to the DataFrame
+            self.tree.insert('', tk.END, iid=str(position), values=[self.format_value(value) for value in row])
+
+        total = len(self.order)
+        if total:
+            self.vscroll.set(self.first_row / total, min(self.first_row + self.visible_rows, total) / total)
+        else:
+            self.vscroll.set(0, 1)
+
+    def scroll_to(self, first_row):
+        last_start = max(len(self.order) - self.visible_rows, 0)
+        first_row = min(max(int(first_row), 0), last_start)
+        if first_row != self.first_row:
+            self.first_row = first_row
+            self.render()
+        return 'break'
+
+    def scroll_rows(self, count):
+        return self.scroll_to(self.first_row + count)
+
+    def on_scrollbar(self, action, amount, unit=None):
+        if action == 'moveto':
+            self.scroll_to(float(amount) * len(self.order))
+        elif action == 'scroll':
+            step = self.visible_rows if unit == 'pages' else 1
+            self.scroll_rows(int(amount) * step)
+
+    def on_mousewheel(self, event):
+        # Windows gives multiples of 120, macOS small numbers
+        steps = event.delta // 120 if abs(event.delta) >= 120 else event.delta
+        return self.scroll_rows(-3 * steps)
+
+    def on_resize(self, event):
+        # Work out how many rows fit in the window now
+        row_height = int(ttk.Style().lookup('Treeview', 'rowheight') or 20)
+        visible_rows = max(event.height // row_height, 1)
+        if visible_rows != self.visible_rows:
+            self.visible_rows = visible_rows
+            self.render()
+
+    def get_row_clicked(self, event):
+        """Returns the DataFrame row position of the row under the mouse, or None."""
+        item = self.tree.identify_row(event.y)
+        return int(item) if item else None
+
+    def bind_rows(self, sequence, func):
+        """Binds an event (like '<Double-Button-1>') on the rows of the table."""
+        self.tree.bind(sequence, func)
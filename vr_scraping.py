@@ -0,0 +1,289 @@
+import glob
+import os
+import re
+import sys
+import time
+from concurrent.futures import ThreadPoolExecutor, as_completed
+from urllib.parse import parse_qsl, urlencode, urljoin, urlsplit, urlunsplit
+import requests
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
+from bs4 import BeautifulSoup
+from http_cache import CachedSession
+
+try:
+    import lxml.html
+    from lxml import etree
+    HTML_PARSER = "lxml"  # C parser, several times faster than html.parser
+except ImportError:
+    lxml = etree = None
+    HTML_PARSER = "html.parser"
+
+# How the pages are parsed: "lxml" = lxml tree + XPath, only looking at the parts the codes need (fast),
+# "soup" = a full BeautifulSoup tree like the old code (also works without lxml). Both give the same results.
+PARSE_BACKEND = "lxml" if lxml is not None else "soup"
+
+# XPath versions of the BeautifulSoup searches (class="..." matches one of the classes of an element)
+CALL_LINKS_XPATH = "//a[starts-with(@href, $prefix)]"
+DATE_XPATH = ".//p[contains(concat(' ', normalize-space(@class), ' '), ' content__list__text__date ')]"
+LOADMORE_XPATH = "//*[contains(concat(' ', normalize-space(@class), ' '), ' content_loadmore ')]"
+
+VR_BASE_URL = "https://www.vr.se"
+LIST_URL = VR_BASE_URL + "/english/applying-for-funding/calls-and-decisions.html?filters=callsOpen;&selectedSubject=all"
+CALL_PATH_PREFIX = "/english/applying-for-funding/calls/"
+
+# Query parameter that selects the page of the list when the "Show more" button has no link of its own
+PAGE_PARAMETER = "page"
+# Stop after this many pages, in case the site keeps returning a "Show more" button
+MAX_PAGES = 50
+# Seconds to wait for the server (connect, read)
+TIMEOUT = (5, 20)
+# Call pages fetched at the same time (be nice to the website)
+MAX_CONCURRENT_REQUESTS = 8
+
+# The subject area on a call page, in the page text
+SUBJECT_PATTERN = re.compile(r'Subject area:\s*(.*?)\s*Support form:')
+
+def make_session(pool_size=10, retries=3, backoff=0.5, cache=None):
+    """
+    A requests session that keeps its connections open between requests (one TLS
+    handshake instead of one per page) and retries failed requests a few times.
+    With an http_cache.HTTPCache, pages that haven't changed are not downloaded again.
+    """
+    session = CachedSession(cache) if cache is not None else requests.Session()
+    retry = Retry(total=retries, backoff_factor=backoff, status_forcelist=(429, 500, 502, 503, 504),
+                  allowed_methods=("GET", "HEAD"))
+    adapter = HTTPAdapter(pool_connections=pool_size, pool_maxsize=pool_size, max_retries=retry)
+    session.mount("http://", adapter)
+    session.mount("https://", adapter)
+    session.headers["User-Agent"] = "Mozilla/5.0 (VR open calls scraper)"
+    return session
+
+def parse_call_links(html, base_url=VR_BASE_URL, backend=None):
+    """
+    Finds the open calls in a page of the calls list.
+    Returns a list of {"Title", "Link", "Date"} like the Selenium scrapers.
+    """
+    if (backend or PARSE_BACKEND) == "lxml":
+        return calls_in_tree(html_tree(html), base_url)
+    return calls_in_soup(BeautifulSoup(html, HTML_PARSER), base_url)
+
+def parse_list_page(html, url, page, page_parameter=PAGE_PARAMETER, base_url=VR_BASE_URL, backend=None):
+    """Parses a page of the calls list once and returns (calls, URL of the next page or None)."""
+    if (backend or PARSE_BACKEND) == "lxml":
+        tree = html_tree(html)
+        return calls_in_tree(tree, base_url), next_page_in_tree(tree, url, page, page_parameter)
+    soup = BeautifulSoup(html, HTML_PARSER)
+    return calls_in_soup(soup, base_url), next_page_url(soup, url, page, page_parameter)
+
+def html_tree(html):
+    """The lxml tree of a page (bytes are read as UTF-8, or Windows-1252 if they aren't valid UTF-8)."""
+    if isinstance(html, bytes):
+        try:
+            html = html.decode("utf-8")
+        except UnicodeDecodeError:
+            html = html.decode("cp1252", errors="replace")
+    if not html.strip():
+        html = "<html></html>"
+    # Parsed as UTF-8 bytes, lxml refuses text that starts with an <?xml encoding=...?> line
+    try:
+        return lxml.html.document_fromstring(html.encode("utf-8"), parser=lxml.html.HTMLParser(encoding="utf-8"))
+    except etree.ParserError:
+        # "Document is empty", e.g. a page with only a comment: no calls, like in BeautifulSoup
+        return lxml.html.document_fromstring("<html></html>")
+
+def element_text(element, strip=False):
+    """Like BeautifulSoup's get_text(): get_text(strip=True) glues the stripped pieces together."""
+    if strip:
+        return "".join(piece.strip() for piece in element.itertext())
+    return "".join(element.itertext())
+
+def calls_in_tree(tree, base_url=VR_BASE_URL):
+    project_details = []
+    for link in tree.xpath(CALL_LINKS_XPATH, prefix=CALL_PATH_PREFIX):
+        parent = next(link.iterancestors("div"), None)
+        dates = parent.xpath(DATE_XPATH) if parent is not None else []
+        project_details.append({
+            "Title": element_text(link, strip=True),
+            "Link": f"{base_url}{link.get('href')}",
+            "Date": element_text(dates[0]).strip() if dates else "No date"
+        })
+    return project_details
+
+def next_page_in_tree(tree, url, page, page_parameter=PAGE_PARAMETER):
+    """next_page_url for an lxml tree."""
+    buttons = tree.xpath(LOADMORE_XPATH)
+    if not buttons:
+        return None
+    href = buttons[0].get("href") or buttons[0].get("data-href")
+    if href and not href.startswith(("#", "javascript:")):
+        return urljoin(url, href)
+    return with_page(url, page + 1, page_parameter)
+
+def calls_in_soup(soup, base_url=VR_BASE_URL):
+    project_details = []
+    for link in soup.find_all("a", href=True):
+        if not link["href"].startswith(CALL_PATH_PREFIX):
+            continue
+        parent = link.find_parent("div")
+        date = parent.find("p", class_="content__list__text__date") if parent else None
+        project_details.append({
+            "Title": link.get_text(strip=True),
+            "Link": f"{base_url}{link['href']}",
+            "Date": date.text.strip() if date else "No date"
+        })
+    return project_details
+
+def with_page(url, page, page_parameter=PAGE_PARAMETER):
+    """The same URL with the page parameter set (the other parameters are kept as they are)."""
+    parts = urlsplit(url)
+    query = [(key, value) for key, value in parse_qsl(parts.query, keep_blank_values=True) if key != page_parameter]
+    query.append((page_parameter, str(page)))
+    return urlunsplit(parts._replace(query=urlencode(query, safe=";")))
+
+def next_page_url(soup, url, page, page_parameter=PAGE_PARAMETER):
+    """
+    The URL of the page after this one (soup is the parsed page), or None if this is the last page.
+    The "Show more" button (class content_loadmore) is followed if it has a link,
+    otherwise the page parameter is counted up.
+    """
+    button = soup.find(class_="content_loadmore")
+    if button is None:
+        return None
+    href = button.get("href") or button.get("data-href")
+    if href and not href.startswith(("#", "javascript:")):
+        return urljoin(url, href)
+    return with_page(url, page + 1, page_parameter)
+
+def fetch_open_calls_http(session=None, list_url=LIST_URL, page_parameter=PAGE_PARAMETER, max_pages=MAX_PAGES,
+                          timeout=TIMEOUT):
+    """
+    Collects all open calls by fetching the pages of the list one after another
+    over plain HTTP, no browser needed. Calls that show up on several pages are only counted once.
+    Returns (calls, complete): complete is True only if the last page of the list was reached,
+    not when max_pages stopped it early.
+    """
+    session = session or make_session()
+    parts = urlsplit(list_url)
+    base_url = f"{parts.scheme}://{parts.netloc}"
+
+    project_details = []
+    seen_links = set()
+    url, page = list_url, 1
+    complete = False
+    while url and page <= max_pages:
+        response = session.get(url, timeout=timeout)
+        response.raise_for_status()
+        calls, next_url = parse_list_page(response.content, url, page, page_parameter, base_url)
+
+        found_before = len(project_details)
+        for call in calls:
+            if call["Link"] not in seen_links:
+                seen_links.add(call["Link"])
+                project_details.append(call)
+        if not calls:
+            # An empty page after the first one is the end of the list. An empty first page
+            # is more likely an error page or a changed site, so it says nothing about the calls.
+            complete = page > 1
+            break
+        if next_url is None:
+            complete = True  # No "Show more" button: that was the whole list
+            break
+        if len(project_details) == found_before:
+            break  # Nothing new, so later pages won't have anything either
+
+        url = next_url
+        page += 1
+    return project_details, complete
+
+def parse_subject_area(html, backend=None):
+    """The "Subject area:" field of a call page, or None if the page doesn't have one."""
+    if (backend or PARSE_BACKEND) == "lxml":
+        tree = html_tree(html)
+        # get_text() leaves out scripts, styles and templates, so do the same
+        etree.strip_elements(tree, "script", "style", "template", with_tail=False)
+        text_content = element_text(tree)
+    else:
+        text_content = BeautifulSoup(html, HTML_PARSER).get_text()
+    match = SUBJECT_PATTERN.search(text_content)
+    return match.group(1).strip() if match else None
+
+def fetch_subject_area(session, url, timeout=TIMEOUT):
+    response = session.get(url, timeout=timeout)
+    response.raise_for_status()
+    return parse_subject_area(response.content)
+
+def fetch_subject_areas(urls, session=None, max_workers=MAX_CONCURRENT_REQUESTS, timeout=TIMEOUT):
+    """
+    Fetches many call pages at the same time (at most max_workers at once, all through
+    one session) and yields (url, subject_area, error) as soon as each page is done,
+    so not in the order of urls. error is None, or the exception if the page failed
+    even after the retries. Stopping the loop early cancels the pages not fetched yet.
+    """
+    session = session or make_session(pool_size=max_workers)
+    executor = ThreadPoolExecutor(max_workers=max_workers)
+    try:
+        futures = {executor.submit(fetch_subject_area, session, url, timeout): url for url in urls}
+        for future in as_completed(futures):
+            url = futures[future]
+            try:
+                yield url, future.result(), None
+            except Exception as e:  # A network error or a page that can't be read, the others go on
+                yield url, None, e
+    finally:
+        executor.shutdown(wait=False, cancel_futures=True)
+
+def benchmark_parsing(file_paths, repeat=20):
+    """
+    Per-page parse time of the old html.parser BeautifulSoup code, BeautifulSoup on lxml
+    and the lxml + XPath backend, on saved pages. List pages (with call links) are parsed
+    for the calls, the other pages for the subject area. Checks that all give the same result.
+    """
+    def old_calls(html):
+        soup = BeautifulSoup(html, 'html.parser')
+        return calls_in_soup(soup)
+
+    def old_subject(html):
+        match = SUBJECT_PATTERN.search(BeautifulSoup(html, 'html.parser').get_text())
+        return match.group(1).strip() if match else None
+
+    pages = []
+    for file_path in file_paths:
+        with open(file_path, "rb") as f:
+            pages.append(f.read())
+    list_pages = [html for html in pages if CALL_PATH_PREFIX.encode() in html and b"content__list" in html]
+    call_pages = [html for html in pages if html not in list_pages]
+
+    def per_page(func, htmls):
+        best = None
+        for _ in range(repeat):
+            start = time.perf_counter()
+            results = [func(html) for html in htmls]
+            elapsed = (time.perf_counter() - start) / len(htmls)
+            best = elapsed if best is None else min(best, elapsed)
+        return results, best * 1000
+
+    for name, htmls, variants in (
+            ("List pages (call links and dates)", list_pages, [
+                ("BeautifulSoup html.parser (old)", old_calls),
+                ("BeautifulSoup lxml", lambda html: parse_call_links(html, backend="soup")),
+                ("lxml + XPath", lambda html: parse_call_links(html, backend="lxml"))]),
+            ("Call pages (subject area)", call_pages, [
+                ("BeautifulSoup html.parser (old)", old_subject),
+                ("BeautifulSoup lxml", lambda html: parse_subject_area(html, backend="soup")),
+                ("lxml", lambda html: parse_subject_area(html, backend="lxml"))])):
+        if not htmls:
+            continue
+        print(f"{name}: {len(htmls)} pages, {sum(map(len, htmls)) // len(htmls) // 1024} KB on average")
+        expected, old_time = per_page(variants[0][1], htmls)
+        for label, func in variants:
+            results, elapsed = (expected, old_time) if func is variants[0][1] else per_page(func, htmls)
+            check = "" if results == expected else "  WARNING: results differ!"
+            print(f"  {label:32} {elapsed:.3f} ms/page  ({old_time / elapsed:.1f}x){check}")
+
+if __name__ == "__main__" and len(sys.argv) >= 2 and sys.argv[1] == "--benchmark":
+    fixtures = os.path.join(os.path.dirname(os.path.abspath(__file__)), "html_fixtures")
+    benchmark_parsing(sys.argv[2:] or sorted(glob.glob(os.path.join(fixtures, "**", "*.html"), recursive=True)))
+
+# This file is used by open_calls.py and user_open_calls.py, you don't need to run it.
+# To compare the speed of the HTML parsing on saved pages: python vr_scraping.py --benchmark (or give your own .html files)